@@ -0,0 +1,178 @@
+import json
+import hashlib
+import sqlite3
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Store the cache next to the other persisted data
+data_dir = Path("./data")
+data_dir.mkdir(exist_ok=True)
+
+_cache_path = data_dir / "analysis_cache.db"
+_connection: Optional[sqlite3.Connection] = None
+_linter_versions: Dict[str, str] = {}
+
+def _get_connection() -> sqlite3.Connection:
+    """Open the cache database lazily, creating the schema on first use."""
+    global _connection
+
+    if _connection is None:
+        _connection = sqlite3.connect(
+            str(_cache_path),
+            isolation_level=None,
+            check_same_thread=False
+        )
+        _connection.execute("PRAGMA journal_mode=WAL")
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS lint_cache ("
+            "key TEXT NOT NULL, "
+            "linter TEXT NOT NULL, "
+            "version TEXT NOT NULL, "
+            "extension TEXT NOT NULL, "
+            "issues_json TEXT NOT NULL, "
+            "PRIMARY KEY (key, linter, version, extension))"
+        )
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, "
+            "issues_json TEXT NOT NULL)"
+        )
+
+    return _connection
+
+def content_key(code_content: str) -> str:
+    """Compute the SHA-256 cache key for a piece of code content."""
+    return hashlib.sha256(code_content.encode()).hexdigest()
+
+def get_linter_version(linter: str) -> str:
+    """
+    Get the installed version string for a linter, memoized per process.
+
+    Args:
+        linter: Name of the linter executable (e.g. 'pylint')
+
+    Returns:
+        Version string, or 'unknown' if the linter cannot be queried
+    """
+    if linter in _linter_versions:
+        return _linter_versions[linter]
+
+    version = "unknown"
+    try:
+        result = subprocess.run(
+            [linter, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        if result.stdout:
+            version = result.stdout.splitlines()[0].strip()
+    except Exception as e:
+        print(f"Error getting {linter} version: {str(e)}")
+
+    _linter_versions[linter] = version
+    return version
+
+def llm_key(model: str, prompt_version: str, code_content: str) -> str:
+    """Compute the cache key for an LLM analysis of a piece of code."""
+    return hashlib.sha256(f"{model}|{prompt_version}|{code_content}".encode()).hexdigest()
+
+def get_cached_llm_issues(key: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Look up cached LLM analysis results.
+
+    Args:
+        key: Cache key from llm_key()
+
+    Returns:
+        The cached issue list, or None on a cache miss
+    """
+    try:
+        row = _get_connection().execute(
+            "SELECT issues_json FROM llm_cache WHERE key=?", (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+    except Exception as e:
+        print(f"Error reading LLM cache: {str(e)}")
+        return None
+
+def store_llm_issues(key: str, issues: List[Dict[str, Any]]) -> bool:
+    """
+    Store parsed LLM analysis results, replacing any previous entry.
+
+    Args:
+        key: Cache key from llm_key()
+        issues: Issue list to cache
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        _get_connection().execute(
+            "INSERT OR REPLACE INTO llm_cache (key, issues_json) VALUES (?, ?)",
+            (key, json.dumps(issues))
+        )
+        return True
+    except Exception as e:
+        print(f"Error writing LLM cache: {str(e)}")
+        return False
+
+def get_cached_issues(key: str, linter: str, version: str,
+                      extension: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Look up cached issues for a content key.
+
+    Args:
+        key: SHA-256 hash of the code content
+        linter: Name of the linter that produced the issues
+        version: Version of the linter
+        extension: File extension (with leading dot)
+
+    Returns:
+        The cached issue list, or None on a cache miss
+    """
+    try:
+        row = _get_connection().execute(
+            "SELECT issues_json FROM lint_cache "
+            "WHERE key=? AND linter=? AND version=? AND extension=?",
+            (key, linter, version, extension)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+    except Exception as e:
+        print(f"Error reading lint cache: {str(e)}")
+        return None
+
+def store_issues(key: str, linter: str, version: str, extension: str,
+                 issues: List[Dict[str, Any]]) -> bool:
+    """
+    Store issues for a content key, replacing any previous entry.
+
+    Args:
+        key: SHA-256 hash of the code content
+        linter: Name of the linter that produced the issues
+        version: Version of the linter
+        extension: File extension (with leading dot)
+        issues: Issue list to cache
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        _get_connection().execute(
+            "INSERT OR REPLACE INTO lint_cache "
+            "(key, linter, version, extension, issues_json) VALUES (?, ?, ?, ?, ?)",
+            (key, linter, version, extension, json.dumps(issues))
+        )
+        return True
+    except Exception as e:
+        print(f"Error writing lint cache: {str(e)}")
+        return False
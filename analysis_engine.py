@@ -1,110 +1,615 @@
 import os
 import re
+import ast
 import json
+import time
+import shutil
 import tempfile
 import subprocess
+import functools
+import threading
+import concurrent.futures
+from bisect import bisect_right
 from typing import Dict, List, Tuple, Any, Optional
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import _cache
+
+# Shared session for OpenAI calls: keep-alive reuses the TCP+TLS connection
+# across requests (the handshake alone costs 100-300 ms per call) and 429/5xx
+# responses are retried with exponential backoff
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+
+class _RateLimiter:
+    """
+    Thread-safe token bucket bounding the OpenAI request rate.
+
+    Tokens refill continuously; acquire() blocks until one is available, so
+    bursts up to the bucket size pass immediately while sustained traffic is
+    capped at the configured rate. Staying under the account's RPM limit
+    avoids 429 responses whose backoff retries would serialize the workload.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        self._lock = threading.Lock()
+        self.configure(requests_per_minute)
+
+    def configure(self, requests_per_minute: float) -> None:
+        """Set the sustained request rate; the bucket holds one minute's worth."""
+        with self._lock:
+            self._rate = requests_per_minute / 60.0
+            self._capacity = float(requests_per_minute)
+            self._tokens = self._capacity
+            self._updated = time.monotonic()
+
+    def acquire(self) -> None:
+        """Block until a request token is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity,
+                                   self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._rate
+            time.sleep(wait)
+
+# Shared limiter for all LLM calls; 500 requests/minute matches the common
+# OpenAI tier, adjustable via set_llm_rate_limit
+_LLM_RATE_LIMITER = _RateLimiter(500)
+
+def set_llm_rate_limit(requests_per_minute: float) -> None:
+    """Reconfigure the shared LLM request rate limit."""
+    _LLM_RATE_LIMITER.configure(requests_per_minute)
+
+# Optional: Hyperscan matches all patterns in a single pass over the bytes,
+# which is much faster than per-line regex scanning on large files
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Optional: orjson parses linter/LLM JSON payloads several times faster than
+# the stdlib and accepts bytes directly, skipping a UTF-8 decode pass
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@functools.lru_cache(maxsize=4096)
+def _splitext_lower(file_path: str) -> str:
+    """Lowercased extension of a path, memoized for hot per-file loops."""
+    return os.path.splitext(file_path)[1].lower()
+
+def _json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+# Markdown code fences GPT commonly wraps JSON responses in
+_CODE_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _extract_json_array(content: str) -> Optional[List[Any]]:
+    """
+    Find the first valid JSON array in an LLM response.
+
+    Scans candidate '[' positions with JSONDecoder.raw_decode — a linear
+    algorithm that handles nested objects correctly, unlike a regex.
+
+    Args:
+        content: Raw response text, possibly with surrounding explanation
+
+    Returns:
+        The parsed array, or None if the response contains no JSON array
+    """
+    content = _CODE_FENCE_RE.sub('', content.strip())
+
+    # Fast path: responses are usually a bare JSON array, which orjson
+    # parses in one C-level call; the scan below only handles responses
+    # with surrounding prose
+    if content.startswith('['):
+        try:
+            parsed = _json_loads(content)
+            if isinstance(parsed, list):
+                return parsed
+        except Exception:
+            pass
+
+    index = content.find('[')
+    while index != -1:
+        try:
+            parsed, _ = _JSON_DECODER.raw_decode(content, index)
+            if isinstance(parsed, list):
+                return parsed
+        except json.JSONDecodeError:
+            pass
+        index = content.find('[', index + 1)
+
+    return None
+
+# Bump when basic_pattern_analysis changes so stale cache entries are ignored
+# Bumped whenever either pattern engine's behavior changes, so cached issue
+# lists never mix semantics across engines or revisions
+_PATTERN_ANALYSIS_VERSION = "3"
+
+# Model and prompt version used for LLM analysis; the prompt version is part
+# of the cache key, so bump it whenever the prompt changes
+_LLM_MODEL = "gpt-4"
+_LLM_PROMPT_VERSION = "2"
+
+# Extension groups used for dispatch, hashed once at module load instead of
+# rebuilding list literals inside the hot loops
+_JS_EXTS = frozenset({'.js', '.jsx', '.ts', '.tsx'})
+_EMPTY_CATCH_EXTS = frozenset({'.py', '.js', '.jsx', '.ts', '.tsx', '.java'})
+
+# Pylint message type to severity level; anything unlisted maps to 'info'
+_PYLINT_SEV = {
+    "error": "error",
+    "fatal": "error",
+    "warning": "warning",
+    "refactor": "warning"
+}
+
+# Patterns used by basic_pattern_analysis, compiled once at module load
+_TODO_RE = re.compile(r'\b(TODO|FIXME)\b', re.IGNORECASE)
+_CREDENTIAL_RE = re.compile(r'(password|secret|key|token)\s*=\s*["\'][^"\']+["\']', re.IGNORECASE)
+_EMPTY_CATCH_RE = re.compile(r'catch\s*\([^)]*\)\s*{\s*}')
+
+# Patterns used by calculate_tech_debt_score, compiled once at module load.
+# Byte patterns so the metric scan can run on the raw encoded content.
+_FUNCTION_DEF_RE = re.compile(rb'^\s*(def|function|class|interface)\s+\w+')
+_RETURN_RE = re.compile(rb'^\s*return\s')
+
+# Optional: xxhash gives a faster 64-bit line hash for duplicate detection
+try:
+    import xxhash
+    _line_hash = xxhash.xxh3_64_intdigest
+except ImportError:
+    _line_hash = hash
+
+# Optional: Numba compiles the metric scan to native code
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Optional: pyahocorasick matches all framework names in one linear pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+_TEST_FRAMEWORKS = ('unittest', 'pytest', 'jest', 'mocha', 'test')
+
+if ahocorasick is not None:
+    _TEST_AUTOMATON = ahocorasick.Automaton()
+    for _word in _TEST_FRAMEWORKS:
+        _TEST_AUTOMATON.add_word(_word, _word)
+    _TEST_AUTOMATON.make_automaton()
+else:
+    _TEST_AUTOMATON = None
+
+def _mentions_test_framework(code_content: str) -> bool:
+    """Check whether the content mentions any known test framework."""
+    # Lowercase once instead of once per framework name
+    haystack = code_content.lower()
+
+    if _TEST_AUTOMATON is not None:
+        for _ in _TEST_AUTOMATON.iter(haystack):
+            return True
+        return False
+
+    return any(framework in haystack for framework in _TEST_FRAMEWORKS)
+
+# Extension-to-language mapping, built once at module load. Callers pass
+# extensions already lowercased via _splitext_lower.
+_EXT_MAP = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.jsx': 'JavaScript (React)',
+    '.ts': 'TypeScript',
+    '.tsx': 'TypeScript (React)',
+    '.java': 'Java',
+    '.c': 'C',
+    '.cpp': 'C++',
+    '.cs': 'C#',
+    '.go': 'Go',
+    '.rb': 'Ruby',
+    '.php': 'PHP',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.scss': 'SCSS',
+    '.sql': 'SQL',
+}
+
+# Pattern ids used by the Hyperscan database
+_HS_TODO = 1
+_HS_CREDENTIAL = 2
+_HS_EMPTY_CATCH = 3
+
+_hs_database = None
+
+def _get_hs_database():
+    """Compile the Hyperscan pattern database on first use."""
+    global _hs_database
+
+    if _hs_database is None:
+        _hs_database = hyperscan.Database()
+        # Case flags mirror the stdlib fallback patterns: TODO and
+        # credential checks are case-insensitive, the catch keyword is not
+        _hs_database.compile(
+            expressions=[
+                rb'\b(TODO|FIXME)\b',
+                rb'(password|secret|key|token)\s*=\s*["\'][^"\']+["\']',
+                rb'catch\s*\([^)]*\)\s*\{\s*\}',
+            ],
+            ids=[_HS_TODO, _HS_CREDENTIAL, _HS_EMPTY_CATCH],
+            flags=[
+                hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST,
+                hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST,
+                hyperscan.HS_FLAG_SOM_LEFTMOST,
+            ]
+        )
+
+    return _hs_database
 
 def run_static_analysis(code_content: str, file_path: str) -> List[Dict[str, Any]]:
     """
     Run static analysis on code content.
-    
+
     Args:
         code_content: The code content as a string
         file_path: Path to the file
-        
+
     Returns:
         List of issues found
     """
-    issues = []
-    file_extension = os.path.splitext(file_path)[1].lower()
-    
-    # Create a temporary file to write the code
-    with tempfile.NamedTemporaryFile(suffix=file_extension, mode='w+', delete=False) as temp_file:
-        temp_file_path = temp_file.name
-        temp_file.write(code_content)
-    
-    try:
-        # Python static analysis
+    return run_static_analysis_batch([(file_path, code_content)])[file_path]
+
+def run_static_analysis_batch(files: List[Tuple[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run static analysis on a batch of files with one linter invocation per tool.
+
+    Each linter (pylint, flake8, eslint) has a startup cost of several hundred
+    milliseconds, so running it once over all files in the batch amortizes that
+    cost instead of paying it per file.
+
+    Args:
+        files: List of (file_path, code_content) pairs
+
+    Returns:
+        Dictionary mapping each file path to its list of issues
+    """
+    issues_by_file: Dict[str, List[Dict[str, Any]]] = {path: [] for path, _ in files}
+
+    py_files = {}
+    js_files = {}
+
+    for path, content in files:
+        file_extension = _splitext_lower(path)
+
         if file_extension == '.py':
-            # Run pylint
-            try:
-                cmd = ["pylint", "--output-format=json", temp_file_path]
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.stdout:
-                    pylint_issues = json.loads(result.stdout)
-                    for issue in pylint_issues:
-                        issues.append({
-                            "line": issue.get("line", 0),
-                            "column": issue.get("column", 0),
-                            "message": issue.get("message", ""),
-                            "severity": map_pylint_severity(issue.get("type", "")),
-                            "rule": issue.get("symbol", "")
-                        })
-            except Exception as e:
-                print(f"Error running pylint: {str(e)}")
-            
-            # Run flake8
-            try:
-                cmd = ["flake8", "--format=json", temp_file_path]
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.stdout:
-                    flake8_issues = json.loads(result.stdout)
-                    for _, issue in flake8_issues.items():
-                        issues.append({
-                            "line": issue.get("line_number", 0),
-                            "column": issue.get("column_number", 0),
-                            "message": issue.get("text", ""),
-                            "severity": "warning",
-                            "rule": issue.get("code", "")
-                        })
-            except Exception as e:
-                print(f"Error running flake8: {str(e)}")
-        
-        # JavaScript/TypeScript static analysis
-        elif file_extension in ['.js', '.jsx', '.ts', '.tsx']:
-            # Run ESLint if available
-            try:
-                cmd = ["eslint", "--format=json", temp_file_path]
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.stdout:
-                    eslint_results = json.loads(result.stdout)
-                    for file_result in eslint_results:
-                        for message in file_result.get("messages", []):
-                            issues.append({
-                                "line": message.get("line", 0),
-                                "column": message.get("column", 0),
-                                "message": message.get("message", ""),
-                                "severity": "error" if message.get("severity", 1) == 2 else "warning",
-                                "rule": message.get("ruleId", "")
-                            })
-            except Exception as e:
-                print(f"Error running eslint: {str(e)}")
-        
-        # Fallback to basic pattern matching for all file types
-        issues.extend(basic_pattern_analysis(code_content, file_extension))
-        
+            # Cheap preflight: skip the linter subprocesses for empty,
+            # tiny, or syntactically broken files
+            preflight = _preflight_python(content)
+            if preflight is not None:
+                issues_by_file[path].extend(preflight)
+                continue
+            py_files[path] = content
+        elif file_extension in _JS_EXTS:
+            js_files[path] = content
+        # Other file types only go through the pattern pass
+
+    content_keys = {path: _cache.content_key(content) for path, content in files}
+
+    # Temp files are only written when a linter actually needs them: a single
+    # cache miss goes through stdin instead, and full cache hits never touch
+    # the filesystem at all
+    py_temp = _TempFiles(py_files)
+    js_temp = _TempFiles(js_files)
+
+    try:
+        # The linters are independent child processes, so run them in
+        # parallel: wall time becomes max(t_linter) instead of the sum
+        tasks = []
+        if py_files:
+            tasks.append(("pylint", ["pylint", "--output-format=json"],
+                          _pylint_stdin_cmd, py_files, py_temp,
+                          content_keys, _parse_pylint_output))
+            tasks.append(("flake8", ["flake8", "--format=json"],
+                          _flake8_stdin_cmd, py_files, py_temp,
+                          content_keys, _parse_flake8_output))
+        if js_files:
+            # ESLint has no reliable stdin mode for our config, so it always
+            # goes through temp files
+            tasks.append(("eslint", ["eslint", "--format=json"],
+                          None, js_files, js_temp,
+                          content_keys, _parse_eslint_output))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(tasks) + 1)) as executor:
+            futures = [executor.submit(_run_linter_cached, *task) for task in tasks]
+            pattern_future = executor.submit(_run_pattern_analysis_cached, files, content_keys)
+
+            for future in futures + [pattern_future]:
+                for path, file_issues in future.result().items():
+                    issues_by_file[path].extend(file_issues)
+
     finally:
-        # Clean up the temporary file
-        try:
-            os.unlink(temp_file_path)
-        except:
-            pass
-    
-    return issues
+        py_temp.cleanup()
+        js_temp.cleanup()
+
+    return issues_by_file
+
+class _TempFiles:
+    """
+    Lazily materializes a batch of files into a temporary directory.
+
+    The directory is only created (and the files only written) the first time
+    a linter asks for real paths; cache hits and stdin runs skip the
+    filesystem entirely.
+    """
+
+    def __init__(self, files_by_path: Dict[str, str]):
+        self._files_by_path = files_by_path
+        self._lock = threading.Lock()
+        self._temp_dir: Optional[str] = None
+        self._temp_path_map: Optional[Dict[str, str]] = None
+
+    def temp_path_map(self) -> Dict[str, str]:
+        """Write the files on first use; returns {temp_path: original_path}."""
+        with self._lock:
+            if self._temp_path_map is None:
+                self._temp_dir = tempfile.mkdtemp(prefix="acmrs_lint_")
+                self._temp_path_map = {}
+                for index, (path, content) in enumerate(self._files_by_path.items()):
+                    temp_path = os.path.join(
+                        self._temp_dir, f"f{index}{_splitext_lower(path)}")
+                    with open(temp_path, 'w') as temp_file:
+                        temp_file.write(content)
+                    self._temp_path_map[temp_path] = path
+            return self._temp_path_map
+
+    def cleanup(self) -> None:
+        """Remove the temporary directory if it was ever created."""
+        with self._lock:
+            if self._temp_dir is not None:
+                shutil.rmtree(self._temp_dir, ignore_errors=True)
+                self._temp_dir = None
+                self._temp_path_map = None
+
+def _pylint_stdin_cmd(display_name: str) -> List[str]:
+    """Build the pylint command reading code from stdin."""
+    return ["pylint", "--from-stdin", display_name, "--output-format=json"]
+
+def _flake8_stdin_cmd(display_name: str) -> List[str]:
+    """Build the flake8 command reading code from stdin."""
+    return ["flake8", "--stdin-display-name", display_name, "--format=json", "-"]
+
+def _preflight_python(code_content: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Cheap checks that can skip the Python linters entirely.
+
+    A linter subprocess costs hundreds of milliseconds regardless of file
+    size; this preflight is microseconds.
+
+    Args:
+        code_content: The code content as a string
+
+    Returns:
+        None when the linters should run, or a (possibly empty) issue list
+        when they can be skipped
+    """
+    if not code_content.strip():
+        return []
+
+    # A broken file would only make the linters crash; report the syntax
+    # error directly, which is also a clearer diagnostic
+    try:
+        ast.parse(code_content)
+    except SyntaxError as e:
+        return [{
+            "line": e.lineno or 0,
+            "column": e.offset or 0,
+            "message": e.msg or "Syntax error",
+            "severity": "error",
+            "rule": "syntax-error"
+        }]
+
+    # Very small files aren't worth a subprocess; the pattern pass covers them
+    if len(code_content.splitlines()) < 5:
+        return []
+
+    return None
+
+def _run_linter_cached(linter: str, cmd_prefix: List[str], stdin_cmd: Optional[Any],
+                       files_by_path: Dict[str, str], temp_files: "_TempFiles",
+                       content_keys: Dict[str, str],
+                       parser: Any) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run one linter over the files that miss the cache and store fresh results.
+
+    Args:
+        linter: Name of the linter executable
+        cmd_prefix: Command and options for a temp-file run of the linter
+        stdin_cmd: Callable building a stdin command for one display name,
+            or None if the linter does not support stdin input
+        files_by_path: Mapping of original file path to code content
+        temp_files: Lazy temp-file materializer for this file group
+        content_keys: Mapping of original file path to content hash
+        parser: Callable turning linter stdout into {original_path: issues}
+
+    Returns:
+        Dictionary mapping original file paths to this linter's issues
+    """
+    version = _cache.get_linter_version(linter)
+    results: Dict[str, List[Dict[str, Any]]] = {}
+
+    # Serve cache hits directly; only run the linter over the misses
+    misses = []
+    for original_path in files_by_path:
+        extension = _splitext_lower(original_path)
+        cached = _cache.get_cached_issues(content_keys[original_path], linter, version, extension)
+
+        if cached is not None:
+            results[original_path] = cached
+        else:
+            misses.append(original_path)
+
+    if not misses:
+        return results
+
+    try:
+        if len(misses) == 1 and stdin_cmd is not None:
+            # One file: pipe it over stdin and skip the temp-file round-trip
+            # (the write, the linter's read, and the directory cleanup)
+            original_path = misses[0]
+            result = subprocess.run(
+                stdin_cmd(original_path),
+                capture_output=True,
+                input=files_by_path[original_path].encode('utf-8')
+            )
+            # The linter reports the display name, i.e. the original path
+            miss_path_map = {original_path: original_path}
+        else:
+            # Several files: linters can't multiplex stdin, so materialize
+            # the batch on disk
+            temp_path_map = temp_files.temp_path_map()
+            miss_set = set(misses)
+            miss_path_map = {temp_path: path for temp_path, path in temp_path_map.items()
+                             if path in miss_set}
+            # Binary mode: orjson parses the bytes directly without re-decoding
+            result = subprocess.run([*cmd_prefix, *miss_path_map], capture_output=True)
+
+        fresh = parser(result.stdout, miss_path_map) if result.stdout else {}
+    except Exception as e:
+        print(f"Error running {linter}: {str(e)}")
+        return results
+
+    # Record results for every miss, including clean files with no issues
+    for original_path in misses:
+        file_issues = fresh.get(original_path, [])
+        results[original_path] = file_issues
+        extension = _splitext_lower(original_path)
+        _cache.store_issues(content_keys[original_path], linter, version, extension, file_issues)
+
+    return results
+
+def _run_pattern_analysis_cached(files: List[Tuple[str, str]],
+                                 content_keys: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Run the basic pattern pass for each file, going through the cache."""
+    results: Dict[str, List[Dict[str, Any]]] = {}
+
+    for path, content in files:
+        file_extension = _splitext_lower(path)
+        cached = _cache.get_cached_issues(
+            content_keys[path], "patterns", _PATTERN_ANALYSIS_VERSION, file_extension)
+
+        if cached is not None:
+            results[path] = cached
+        else:
+            pattern_issues = basic_pattern_analysis(content, file_extension)
+            results[path] = pattern_issues
+            _cache.store_issues(content_keys[path], "patterns",
+                                _PATTERN_ANALYSIS_VERSION, file_extension, pattern_issues)
+
+    return results
+
+def _parse_pylint_output(stdout: bytes, temp_path_map: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Parse pylint JSON output into issues grouped by original file path."""
+    results: Dict[str, List[Dict[str, Any]]] = {}
+
+    # Pylint's output is flat, so group by reported path first: the path
+    # resolution then runs once per file and the issue dicts are built in a
+    # single comprehension per file
+    by_reported_path: Dict[str, List[Dict[str, Any]]] = {}
+    for issue in _json_loads(stdout):
+        by_reported_path.setdefault(issue.get("path", ""), []).append(issue)
+
+    for reported_path, file_issues in by_reported_path.items():
+        original_path = _resolve_temp_path(reported_path, temp_path_map)
+        if original_path is None:
+            continue
+        results.setdefault(original_path, []).extend([{
+            "line": issue.get("line", 0),
+            "column": issue.get("column", 0),
+            "message": issue.get("message", ""),
+            "severity": _PYLINT_SEV.get(issue.get("type", ""), "info"),
+            "rule": issue.get("symbol", "")
+        } for issue in file_issues])
+
+    return results
+
+def _parse_flake8_output(stdout: bytes, temp_path_map: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Parse flake8 JSON output into issues grouped by original file path."""
+    results: Dict[str, List[Dict[str, Any]]] = {}
+
+    for temp_path, file_issues in _json_loads(stdout).items():
+        original_path = _resolve_temp_path(temp_path, temp_path_map)
+        if original_path is None:
+            continue
+        results.setdefault(original_path, []).extend([{
+            "line": issue.get("line_number", 0),
+            "column": issue.get("column_number", 0),
+            "message": issue.get("text", ""),
+            "severity": "warning",
+            "rule": issue.get("code", "")
+        } for issue in file_issues])
+
+    return results
+
+def _parse_eslint_output(stdout: bytes, temp_path_map: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Parse ESLint JSON output into issues grouped by original file path."""
+    results: Dict[str, List[Dict[str, Any]]] = {}
+
+    for file_result in _json_loads(stdout):
+        original_path = _resolve_temp_path(file_result.get("filePath", ""), temp_path_map)
+        if original_path is None:
+            continue
+        results.setdefault(original_path, []).extend([{
+            "line": message.get("line", 0),
+            "column": message.get("column", 0),
+            "message": message.get("message", ""),
+            "severity": "error" if message.get("severity", 1) == 2 else "warning",
+            "rule": message.get("ruleId", "")
+        } for message in file_result.get("messages", [])])
+
+    return results
+
+def _resolve_temp_path(reported_path: str, temp_path_map: Dict[str, str]) -> Optional[str]:
+    """Map a path reported by a linter back to the original file path."""
+    if reported_path in temp_path_map:
+        return temp_path_map[reported_path]
+
+    # Linters may report absolute or relative variants of the temp path
+    normalized = os.path.abspath(reported_path)
+    for temp_path, original_path in temp_path_map.items():
+        if os.path.abspath(temp_path) == normalized:
+            return original_path
+
+    return None
 
 def map_pylint_severity(pylint_type: str) -> str:
     """Map pylint message type to severity level."""
-    if pylint_type in ["error", "fatal"]:
-        return "error"
-    elif pylint_type in ["warning", "refactor"]:
-        return "warning"
-    else:
-        return "info"
+    return _PYLINT_SEV.get(pylint_type, "info")
 
 def basic_pattern_analysis(code_content: str, file_extension: str) -> List[Dict[str, Any]]:
     """
@@ -117,11 +622,21 @@ def basic_pattern_analysis(code_content: str, file_extension: str) -> List[Dict[
     Returns:
         List of issues found
     """
+    if hyperscan is not None:
+        try:
+            return _pattern_analysis_hyperscan(code_content, file_extension)
+        except Exception as e:
+            print(f"Error in hyperscan pattern analysis: {str(e)}")
+
+    return _pattern_analysis_regex(code_content, file_extension)
+
+def _pattern_analysis_regex(code_content: str, file_extension: str) -> List[Dict[str, Any]]:
+    """Pattern analysis fallback using the compiled stdlib regexes."""
     issues = []
     lines = code_content.splitlines()
-    
-    # Check line length
     max_line_length = 100
+
+    # Evaluate all per-line checks in a single pass
     for i, line in enumerate(lines):
         if len(line) > max_line_length:
             issues.append({
@@ -131,11 +646,8 @@ def basic_pattern_analysis(code_content: str, file_extension: str) -> List[Dict[
                 "severity": "info",
                 "rule": "line-length"
             })
-    
-    # Check for TODO/FIXME comments
-    todo_pattern = re.compile(r'\b(TODO|FIXME)\b', re.IGNORECASE)
-    for i, line in enumerate(lines):
-        if todo_pattern.search(line):
+
+        if _TODO_RE.search(line):
             issues.append({
                 "line": i + 1,
                 "column": 1,
@@ -143,11 +655,8 @@ def basic_pattern_analysis(code_content: str, file_extension: str) -> List[Dict[
                 "severity": "info",
                 "rule": "todo-comment"
             })
-    
-    # Check for hardcoded credentials
-    credential_pattern = re.compile(r'(password|secret|key|token)\s*=\s*["\'][^"\']+["\']', re.IGNORECASE)
-    for i, line in enumerate(lines):
-        if credential_pattern.search(line):
+
+        if _CREDENTIAL_RE.search(line):
             issues.append({
                 "line": i + 1,
                 "column": 1,
@@ -155,144 +664,611 @@ def basic_pattern_analysis(code_content: str, file_extension: str) -> List[Dict[
                 "severity": "error",
                 "rule": "hardcoded-credential"
             })
-    
-    # Check for empty catch blocks
-    if file_extension in ['.py', '.js', '.jsx', '.ts', '.tsx', '.java']:
-        empty_catch_pattern = re.compile(r'catch\s*\([^)]*\)\s*{\s*}')
-        code_without_newlines = ' '.join(lines)
-        if empty_catch_pattern.search(code_without_newlines):
+
+    # Check for empty catch blocks: every occurrence is reported, at most
+    # once per line, matching the Hyperscan path
+    if file_extension in _EMPTY_CATCH_EXTS:
+        # \s in the pattern already matches newlines, so search the original
+        # content directly instead of allocating a re-joined copy of it
+        seen_lines = set()
+        for match in _EMPTY_CATCH_RE.finditer(code_content):
+            line = code_content.count('\n', 0, match.start()) + 1
+            if line in seen_lines:
+                continue
+            seen_lines.add(line)
             issues.append({
-                "line": 1,  # Can't determine exact line
+                "line": line,
                 "column": 1,
                 "message": "Empty catch block found",
                 "severity": "warning",
                 "rule": "empty-catch"
             })
-    
+
+    return issues
+
+def _pattern_analysis_hyperscan(code_content: str, file_extension: str) -> List[Dict[str, Any]]:
+    """
+    Pattern analysis using a single Hyperscan pass over the raw bytes.
+
+    All patterns are matched in one scan; match offsets are converted back to
+    line numbers by bisecting a precomputed array of newline positions.
+    """
+    issues = []
+    buf = code_content.encode('utf-8', errors='replace')
+
+    # Newline offsets for O(log n) offset-to-line conversion
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    newline_offsets = np.where(arr == 0x0A)[0].tolist()
+
+    check_empty_catch = file_extension in _EMPTY_CATCH_EXTS
+    seen = set()
+    matches = []
+
+    def on_match(pattern_id, start, end, flags, context):
+        matches.append((pattern_id, start))
+
+    _get_hs_database().scan(buf, match_event_handler=on_match)
+
+    for pattern_id, start in matches:
+        line = bisect_right(newline_offsets, start - 1) + 1
+
+        # Report each pattern at most once per line, matching the semantics
+        # of the per-line regex search in the fallback path
+        if (pattern_id, line) in seen:
+            continue
+        seen.add((pattern_id, line))
+
+        if pattern_id == _HS_TODO:
+            issues.append({
+                "line": line,
+                "column": 1,
+                "message": "TODO or FIXME comment found",
+                "severity": "info",
+                "rule": "todo-comment"
+            })
+        elif pattern_id == _HS_CREDENTIAL:
+            issues.append({
+                "line": line,
+                "column": 1,
+                "message": "Possible hardcoded credential found",
+                "severity": "error",
+                "rule": "hardcoded-credential"
+            })
+        elif pattern_id == _HS_EMPTY_CATCH and check_empty_catch:
+            issues.append({
+                "line": line,
+                "column": 1,
+                "message": "Empty catch block found",
+                "severity": "warning",
+                "rule": "empty-catch"
+            })
+
+    # Line length still needs a per-line pass
+    max_line_length = 100
+    lines = code_content.splitlines()
+    for i, line in enumerate(lines):
+        if len(line) > max_line_length:
+            issues.append({
+                "line": i + 1,
+                "column": max_line_length + 1,
+                "message": f"Line too long ({len(line)}/{max_line_length})",
+                "severity": "info",
+                "rule": "line-length"
+            })
+
     return issues
 
 def run_llm_analysis(code_content: str, file_path: str, openai_api_key: str) -> List[Dict[str, Any]]:
     """
     Run LLM-based analysis on code content.
-    
+
     Args:
         code_content: The code content as a string
         file_path: Path to the file
         openai_api_key: OpenAI API key
-        
+
     Returns:
         List of issues found
     """
-    # Skip very large files
-    if len(code_content) > 10000:  # ~10KB limit
-        return [{
-            "line": 1,
-            "message": "File too large for LLM analysis",
-            "severity": "info",
-            "fix": "Consider breaking the file into smaller modules"
-        }]
-    
-    # Prepare the API request
-    file_extension = os.path.splitext(file_path)[1].lower()
-    language = get_language_from_extension(file_extension)
-    
-    # Create a prompt for the LLM
+    return run_llm_analysis_batch([(file_path, code_content)], openai_api_key)[file_path]
+
+def run_llm_analysis_batch(files: List[Tuple[str, str]], openai_api_key: str,
+                           batch_size: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run LLM-based analysis on a batch of files with few API round-trips.
+
+    Files are packed into chunks of up to batch_size files (bounded by an
+    estimated token budget) and each chunk is analyzed in one API call, so
+    the network and prompt overhead is amortized across the chunk. Cached
+    and oversized files never reach the API.
+
+    Args:
+        files: List of (file_path, code_content) pairs
+        openai_api_key: OpenAI API key
+        batch_size: Maximum number of files per API call
+
+    Returns:
+        Dictionary mapping each file path to its list of issues
+    """
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    pending = []
+
+    for path, content in files:
+        # Skip very large files
+        if len(content) > 10000:  # ~10KB limit
+            results[path] = [{
+                "line": 1,
+                "message": "File too large for LLM analysis",
+                "severity": "info",
+                "fix": "Consider breaking the file into smaller modules"
+            }]
+            continue
+
+        # Serve previously analyzed content straight from the cache: a hit
+        # replaces a multi-second API round-trip with a single SELECT
+        cached = _cache.get_cached_llm_issues(
+            _cache.llm_key(_LLM_MODEL, _LLM_PROMPT_VERSION, content))
+        if cached is not None:
+            results[path] = cached
+        else:
+            pending.append((path, content))
+
+    # Pack the remaining files into chunks bounded by batch_size and a rough
+    # token budget (~4 characters per token)
+    token_budget = 6000
+    chunks = []
+    current: List[Tuple[str, str]] = []
+    current_tokens = 0
+
+    for path, content in pending:
+        estimated_tokens = len(content) // 4
+        if current and (len(current) >= batch_size
+                        or current_tokens + estimated_tokens > token_budget):
+            chunks.append(current)
+            current = []
+            current_tokens = 0
+        current.append((path, content))
+        current_tokens += estimated_tokens
+    if current:
+        chunks.append(current)
+
+    for chunk in chunks:
+        chunk_issues = _call_llm_chunk(chunk, openai_api_key)
+
+        # A failed multi-file response (e.g. truncated or malformed JSON)
+        # retries one file per call so a bad chunk doesn't silently zero
+        # out every file packed into it
+        if chunk_issues is None and len(chunk) > 1:
+            for path, content in chunk:
+                single_issues = _call_llm_chunk([(path, content)], openai_api_key)
+                if single_issues is None:
+                    results[path] = []
+                else:
+                    issues = single_issues.get(0, [])
+                    results[path] = issues
+                    _cache.store_llm_issues(
+                        _cache.llm_key(_LLM_MODEL, _LLM_PROMPT_VERSION, content), issues)
+            continue
+
+        for index, (path, content) in enumerate(chunk):
+            if chunk_issues is None:
+                results[path] = []
+            else:
+                issues = chunk_issues.get(index, [])
+                results[path] = issues
+                # Only successful calls are cached so transient API failures
+                # don't poison future lookups
+                _cache.store_llm_issues(
+                    _cache.llm_key(_LLM_MODEL, _LLM_PROMPT_VERSION, content), issues)
+
+    return results
+
+def run_llm_analysis_many(files: List[Tuple[str, str]], openai_api_key: str,
+                          max_workers: int = 8) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run LLM analysis on many files concurrently, one API call per unique file.
+
+    Complements run_llm_analysis_batch: instead of packing small files into
+    shared prompts, each unique content gets its own API call and the calls
+    run in parallel, so wall time is roughly max(t_i) up to max_workers
+    instead of sum(t_i). Identical files (same content hash) collapse to a
+    single call whose result fans out to every path. Retries with backoff on
+    429/5xx come from the shared session.
+
+    Args:
+        files: List of (file_path, code_content) pairs
+        openai_api_key: OpenAI API key
+        max_workers: Maximum number of concurrent API calls
+
+    Returns:
+        Dictionary mapping each file path to its list of issues
+    """
+    results: Dict[str, List[Dict[str, Any]]] = {}
+
+    # De-duplicate: one call per unique content, fanned out to all its paths
+    paths_by_content: Dict[str, List[str]] = {}
+    for path, content in files:
+        paths_by_content.setdefault(content, []).append(path)
+
+    # Serve cache hits inline so re-runs of an unchanged PR never touch the
+    # thread pool, let alone the API
+    for content in list(paths_by_content):
+        cached = _cache.get_cached_llm_issues(
+            _cache.llm_key(_LLM_MODEL, _LLM_PROMPT_VERSION, content))
+        if cached is not None:
+            for path in paths_by_content.pop(content):
+                results[path] = cached
+
+    if not paths_by_content:
+        return results
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_llm_analysis_batch, [(paths[0], content)], openai_api_key): (content, paths)
+            for content, paths in paths_by_content.items()
+        }
+
+        for future in concurrent.futures.as_completed(futures):
+            content, paths = futures[future]
+            try:
+                issues = future.result()[paths[0]]
+            except Exception as e:
+                print(f"Error in LLM analysis for {paths[0]}: {str(e)}")
+                issues = []
+            for path in paths:
+                results[path] = issues
+
+    return results
+
+def _call_llm_chunk(chunk: List[Tuple[str, str]],
+                    openai_api_key: str) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+    """
+    Analyze one chunk of files in a single API call.
+
+    Args:
+        chunk: List of (file_path, code_content) pairs
+        openai_api_key: OpenAI API key
+
+    Returns:
+        Dictionary mapping chunk index to issues, or None if the call failed
+    """
+    # Create a prompt covering every file in the chunk
+    file_sections = []
+    for index, (path, content) in enumerate(chunk):
+        language = get_language_from_extension(_splitext_lower(path))
+        file_sections.append(f"""
+    FILE {index} ({language}): {path}
+    ```{language}
+    {content}
+    ```
+    """)
+
     prompt = f"""
-    You are an expert code reviewer specializing in {language} development.
-    Analyze the following code for potential issues:
-    
+    You are an expert code reviewer.
+    Analyze each of the following {len(chunk)} files for potential issues:
+
     1. Bugs and logical errors
     2. Maintainability issues
     3. Performance concerns
     4. Security vulnerabilities
     5. Best practice violations
-    
+
     For each issue, provide:
     - Line number
     - Brief description of the issue
     - Severity (error, warning, info)
     - Suggested fix
-    
-    Respond with a JSON array of issues, with each issue having the fields: "line", "message", "severity", and "fix".
+
+    Respond with a JSON array containing one object per file. Each object must have
+    the fields "file_index" (the FILE number) and "issues" (an array of issues, each
+    with the fields "line", "message", "severity", and "fix").
     Only include actual issues - do not make up problems if the code looks good.
-    
-    CODE:
-    ```{language}
-    {code_content}
-    ```
+    {''.join(file_sections)}
     """
-    
+
     # Make the API request
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {openai_api_key}"
     }
-    
+
     data = {
-        "model": "gpt-4",
+        "model": _LLM_MODEL,
         "messages": [
             {"role": "system", "content": "You are an expert code reviewer."},
             {"role": "user", "content": prompt}
         ],
         "temperature": 0.1,
-        "max_tokens": 1500
+        # Scale the response budget with the number of files sharing the
+        # call, capped to leave room for the prompt in the model context;
+        # a truncated array would fail parsing and drop the whole chunk
+        "max_tokens": min(1500 * len(chunk), 4000),
+        "stream": True
     }
-    
+
     try:
-        response = requests.post(
+        # Respect the account's requests-per-minute budget before sending
+        _LLM_RATE_LIMITER.acquire()
+
+        response = _SESSION.post(
             "https://api.openai.com/v1/chat/completions",
             headers=headers,
-            json=data
+            json=data,
+            stream=True
         )
-        
+
         if response.status_code != 200:
             print(f"Error from OpenAI API: {response.status_code} - {response.text}")
-            return []
-        
-        result = response.json()
-        content = result["choices"][0]["message"]["content"]
-        
-        # Extract JSON array from response (sometimes it includes explanation text)
-        json_match = re.search(r'\[\s*{[^]]*}\s*\]', content, re.DOTALL)
-        if json_match:
-            issues_json = json_match.group(0)
-        else:
-            issues_json = content
-        
-        # Parse the JSON response
-        try:
-            issues = json.loads(issues_json)
-            return issues
-        except json.JSONDecodeError:
-            print(f"Error parsing LLM response as JSON: {issues_json}")
-            return []
-            
+            return None
+
+        content = _accumulate_sse_content(response)
+
+        # Extract the JSON array from the response (sometimes it includes
+        # explanation text or code fences) and demultiplex by file index
+        parsed = _extract_json_array(content)
+        if parsed is None:
+            print(f"Error parsing LLM response as JSON: {content}")
+            return None
+
+        chunk_issues: Dict[int, List[Dict[str, Any]]] = {}
+        for entry in parsed:
+            if isinstance(entry, dict) and "file_index" in entry:
+                chunk_issues[entry["file_index"]] = entry.get("issues", [])
+
+        return chunk_issues
+
     except Exception as e:
         print(f"Error calling OpenAI API: {str(e)}")
-        return []
+        return None
+
+def _accumulate_sse_content(response: requests.Response) -> str:
+    """
+    Accumulate the message content from a streamed chat completion.
+
+    Each server-sent event carries a small content delta; decoding deltas as
+    they arrive overlaps the JSON parsing with the model's generation time
+    instead of idling until the full response lands.
+
+    Args:
+        response: Streaming response from the chat completions endpoint
+
+    Returns:
+        The full message content assembled from the deltas
+    """
+    parts = []
+
+    for line in response.iter_lines():
+        if not line.startswith(b"data: "):
+            continue
+        payload = line[6:]
+        if payload == b"[DONE]":
+            break
+        try:
+            delta = _json_loads(payload)["choices"][0].get("delta", {})
+        except Exception:
+            continue
+        piece = delta.get("content")
+        if piece:
+            parts.append(piece)
+
+    return ''.join(parts)
 
 def get_language_from_extension(file_extension: str) -> str:
-    """Map file extension to language name."""
-    extension_map = {
-        '.py': 'Python',
-        '.js': 'JavaScript',
-        '.jsx': 'JavaScript (React)',
-        '.ts': 'TypeScript',
-        '.tsx': 'TypeScript (React)',
-        '.java': 'Java',
-        '.c': 'C',
-        '.cpp': 'C++',
-        '.cs': 'C#',
-        '.go': 'Go',
-        '.rb': 'Ruby',
-        '.php': 'PHP',
-        '.html': 'HTML',
-        '.css': 'CSS',
-        '.scss': 'SCSS',
-        '.sql': 'SQL',
-    }
-    
-    return extension_map.get(file_extension.lower(), 'Unknown')
+    """Map a lowercased file extension to a language name."""
+    return _EXT_MAP.get(file_extension, 'Unknown')
+
+def _scan_line_metrics(buf: bytes) -> Tuple[int, int, int, int, int, int, bool]:
+    """
+    Gather raw per-line metrics for tech-debt scoring in a single byte pass.
+
+    Uses the Numba-compiled kernel when numba is installed; falls back to the
+    pure-Python scan otherwise.
+
+    Args:
+        buf: UTF-8 encoded file content
+
+    Returns:
+        Tuple of (total_lines, max_indentation, function_lines,
+        function_count, duplicate_count, comment_lines, has_docstring)
+    """
+    if numba is not None and buf:
+        try:
+            arr = np.frombuffer(buf, dtype=np.uint8)
+
+            # Power-of-two open-addressing table sized at twice the line count
+            estimated_lines = buf.count(b'\n') + 2
+            table_size = max(16, 1 << (2 * estimated_lines - 1).bit_length())
+            table = np.zeros(table_size, dtype=np.uint64)
+
+            result = _scan_metrics_kernel(arr, table)
+            return result[:6] + (bool(result[6]),)
+        except Exception as e:
+            print(f"Error in compiled metric scan: {str(e)}")
+
+    return _scan_line_metrics_python(buf)
+
+def _scan_line_metrics_python(buf: bytes) -> Tuple[int, int, int, int, int, int, bool]:
+    """Pure-Python fallback for _scan_line_metrics."""
+    total_lines = 0
+    max_indentation = 0
+    function_lines = 0
+    in_function = False
+    function_count = 0
+    duplicate_count = 0
+    seen_hashes = set()
+    comment_lines = 0
+    has_docstring = False
+
+    lines = buf.split(b'\n')
+    if lines and lines[-1] == b'':
+        lines.pop()
+
+    for line in lines:
+        total_lines += 1
+        stripped = line.lstrip()
+        line_stripped = stripped.rstrip()
+
+        # Check indentation level
+        if stripped:  # Non-empty line
+            indentation = len(line) - len(stripped)
+            if indentation > max_indentation:
+                max_indentation = indentation
+
+        # Count function lines (very basic detection)
+        if _FUNCTION_DEF_RE.match(line):
+            in_function = True
+            function_count += 1
+            function_lines = 1
+        elif in_function:
+            function_lines += 1
+            if line_stripped == b'}' or _RETURN_RE.match(line):
+                in_function = False
+
+        # Check for repeated lines, ignoring short ones; duplicates are
+        # tracked as 64-bit hashes so the set holds cheap ints, not slices
+        if len(line_stripped) > 10:
+            line_hash = _line_hash(line_stripped)
+            if line_hash in seen_hashes:
+                duplicate_count += 1
+            else:
+                seen_hashes.add(line_hash)
+
+        # Check for various comment formats
+        head = line_stripped[:2]
+        if line_stripped[:1] == b'#' or head == b'//' or head == b'/*':
+            comment_lines += 1
+        # Check for docstrings (Python)
+        if line_stripped[:3] in (b'"""', b"'''"):
+            has_docstring = True
+
+    return (total_lines, max_indentation, function_lines, function_count,
+            duplicate_count, comment_lines, has_docstring)
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _scan_metrics_kernel(buf, table):
+        """
+        Native-code metric scan over a uint8 buffer.
+
+        Mirrors _scan_line_metrics_python byte for byte: whitespace is the
+        ASCII \\s set, function/return detection replicates the byte regexes,
+        and duplicate lines are tracked via FNV-1a hashes in an
+        open-addressing table (zero marks an empty slot).
+
+        Deliberately sequential (no parallel=True/prange): the duplicate
+        table and the in_function state carry dependencies across lines, so
+        splitting the buffer would race on them and change the results.
+        """
+        n = buf.size
+        mask = np.uint64(table.size - 1)
+        fnv_offset = np.uint64(0xcbf29ce484222325)
+        fnv_prime = np.uint64(0x100000001b3)
+
+        total_lines = 0
+        max_indentation = 0
+        function_lines = 0
+        function_count = 0
+        in_function = False
+        duplicate_count = 0
+        comment_lines = 0
+        has_docstring = 0
+
+        i = 0
+        while i < n:
+            # Find end of line
+            j = i
+            while j < n and buf[j] != 10:
+                j += 1
+
+            total_lines += 1
+
+            # Strip leading and trailing whitespace
+            ls = i
+            while ls < j and (buf[ls] == 32 or buf[ls] == 9 or (11 <= buf[ls] <= 13)):
+                ls += 1
+            le = j
+            while le > ls and (buf[le - 1] == 32 or buf[le - 1] == 9 or (11 <= buf[le - 1] <= 13)):
+                le -= 1
+
+            if ls < j:
+                indent = ls - i
+                if indent > max_indentation:
+                    max_indentation = indent
+
+            # Function start: (def|function|class|interface) then \s+ then \w
+            keyword_len = 0
+            if ls + 3 <= j and buf[ls] == 100 and buf[ls + 1] == 101 and buf[ls + 2] == 102:
+                keyword_len = 3  # def
+            elif (ls + 8 <= j and buf[ls] == 102 and buf[ls + 1] == 117 and buf[ls + 2] == 110
+                  and buf[ls + 3] == 99 and buf[ls + 4] == 116 and buf[ls + 5] == 105
+                  and buf[ls + 6] == 111 and buf[ls + 7] == 110):
+                keyword_len = 8  # function
+            elif (ls + 5 <= j and buf[ls] == 99 and buf[ls + 1] == 108 and buf[ls + 2] == 97
+                  and buf[ls + 3] == 115 and buf[ls + 4] == 115):
+                keyword_len = 5  # class
+            elif (ls + 9 <= j and buf[ls] == 105 and buf[ls + 1] == 110 and buf[ls + 2] == 116
+                  and buf[ls + 3] == 101 and buf[ls + 4] == 114 and buf[ls + 5] == 102
+                  and buf[ls + 6] == 97 and buf[ls + 7] == 99 and buf[ls + 8] == 101):
+                keyword_len = 9  # interface
+
+            matched_def = False
+            if keyword_len > 0:
+                p = ls + keyword_len
+                if p < j and (buf[p] == 32 or buf[p] == 9 or (11 <= buf[p] <= 13)):
+                    while p < j and (buf[p] == 32 or buf[p] == 9 or (11 <= buf[p] <= 13)):
+                        p += 1
+                    if p < j:
+                        c = buf[p]
+                        if (48 <= c <= 57) or (65 <= c <= 90) or (97 <= c <= 122) or c == 95:
+                            matched_def = True
+
+            if matched_def:
+                in_function = True
+                function_count += 1
+                function_lines = 1
+            elif in_function:
+                function_lines += 1
+                is_return = False
+                if (ls + 6 <= j and buf[ls] == 114 and buf[ls + 1] == 101 and buf[ls + 2] == 116
+                        and buf[ls + 3] == 117 and buf[ls + 4] == 114 and buf[ls + 5] == 110):
+                    p = ls + 6
+                    if p < j and (buf[p] == 32 or buf[p] == 9 or (11 <= buf[p] <= 13)):
+                        is_return = True
+                if (le - ls == 1 and buf[ls] == 125) or is_return:
+                    in_function = False
+
+            length = le - ls
+
+            # Duplicate detection via FNV-1a and open addressing
+            if length > 10:
+                h = fnv_offset
+                for p in range(ls, le):
+                    h = (h ^ np.uint64(buf[p])) * fnv_prime
+                if h == np.uint64(0):
+                    h = np.uint64(1)
+                idx = h & mask
+                while table[idx] != np.uint64(0) and table[idx] != h:
+                    idx = (idx + np.uint64(1)) & mask
+                if table[idx] == h:
+                    duplicate_count += 1
+                else:
+                    table[idx] = h
+
+            # Comments: '#', '//', '/*'
+            if length >= 1 and buf[ls] == 35:
+                comment_lines += 1
+            elif length >= 2 and buf[ls] == 47 and (buf[ls + 1] == 47 or buf[ls + 1] == 42):
+                comment_lines += 1
+
+            # Docstrings: triple quotes
+            if length >= 3 and ((buf[ls] == 34 and buf[ls + 1] == 34 and buf[ls + 2] == 34)
+                                or (buf[ls] == 39 and buf[ls + 1] == 39 and buf[ls + 2] == 39)):
+                has_docstring = 1
+
+            i = j + 1
+
+        return (total_lines, max_indentation, function_lines, function_count,
+                duplicate_count, comment_lines, has_docstring)
 
 def calculate_tech_debt_score(code_content: str, file_path: str, issues: List[Dict[str, Any]]) -> Tuple[float, Dict[str, float]]:
     """
@@ -315,71 +1291,26 @@ def calculate_tech_debt_score(code_content: str, file_path: str, issues: List[Di
         "test_coverage": 0.0
     }
     
-    lines = code_content.splitlines()
-    total_lines = len(lines)
-    
+    # Scan the encoded bytes once; per-line work stays on byte slices so no
+    # per-line str objects are decoded
+    buf = code_content.encode('utf-8', errors='replace')
+    (total_lines, max_indentation, function_lines, function_count,
+     duplicate_count, comment_lines, has_docstring) = _scan_line_metrics(buf)
+
     # Skip empty files
     if total_lines == 0:
         return 0.0, debt_details
-    
-    # Calculate complexity score based on various metrics
-    
+
     # 1. Complexity: based on indentation and function length
-    max_indentation = 0
-    function_lines = 0
-    in_function = False
-    function_count = 0
-    
-    for line in lines:
-        # Check indentation level
-        stripped = line.lstrip()
-        if stripped:  # Non-empty line
-            indentation = len(line) - len(stripped)
-            max_indentation = max(max_indentation, indentation)
-        
-        # Count function lines (very basic detection)
-        if re.match(r'^\s*(def|function|class|interface)\s+\w+', line):
-            in_function = True
-            function_count += 1
-            function_lines = 1
-        elif in_function:
-            function_lines += 1
-            if line.strip() == '}' or re.match(r'^\s*return\s', line):
-                in_function = False
-    
-    # Calculate complexity scores
     avg_indentation = max_indentation / 4  # Normalize to 0-5 range approximately
     complexity_score = min(100, (avg_indentation * 20) + (function_lines / max(1, function_count) / 5))
     debt_details["complexity"] = complexity_score
-    
-    # 2. Duplication: check for repeated lines
-    line_hash = {}
-    duplicate_count = 0
-    
-    for line in lines:
-        line_stripped = line.strip()
-        if len(line_stripped) > 10:  # Ignore short lines
-            if line_stripped in line_hash:
-                duplicate_count += 1
-            else:
-                line_hash[line_stripped] = True
-    
+
+    # 2. Duplication: repeated lines found in the fused pass
     duplication_score = min(100, (duplicate_count / max(1, total_lines)) * 200)  # Normalize to 0-100
     debt_details["duplication"] = duplication_score
-    
+
     # 3. Documentation: comments and docstrings
-    comment_lines = 0
-    has_docstring = False
-    
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
-        # Check for various comment formats
-        if line_stripped.startswith('#') or line_stripped.startswith('//') or line_stripped.startswith('/*'):
-            comment_lines += 1
-        # Check for docstrings (Python)
-        if line_stripped.startswith('"""') or line_stripped.startswith("'''"):
-            has_docstring = True
-    
     comment_ratio = comment_lines / max(1, total_lines)
     documentation_score = min(100, (1 - comment_ratio) * 100)
     if has_docstring:
@@ -405,11 +1336,8 @@ def calculate_tech_debt_score(code_content: str, file_path: str, issues: List[Di
         test_coverage_score = 0  # Test files don't have test debt
     else:
         # Check for import of test frameworks
-        test_frameworks = ['unittest', 'pytest', 'jest', 'mocha', 'test']
-        for framework in test_frameworks:
-            if framework in code_content.lower():
-                test_coverage_score = 30  # Reduce score if testing is mentioned
-                break
+        if _mentions_test_framework(code_content):
+            test_coverage_score = 30  # Reduce score if testing is mentioned
     
     debt_details["test_coverage"] = test_coverage_score
     
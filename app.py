@@ -1,16 +1,23 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-import json
 import os
+import hashlib
 import datetime
 from pathlib import Path
-import matplotlib.pyplot as plt
 import time
 
 # Import custom modules
-from github_utils import fetch_github_pr, get_file_content
-from analysis_engine import run_static_analysis, run_llm_analysis, calculate_tech_debt_score
+from concurrent.futures import ThreadPoolExecutor
+
+from github_utils import fetch_github_pr, get_file_content, extract_patch_context_with_map
+from analysis_engine import (
+    run_static_analysis_batch,
+    run_llm_analysis_batch,
+    run_llm_analysis_many,
+    calculate_tech_debt_score,
+    set_llm_rate_limit,
+)
 from visualizations import render_annotated_code, create_tech_debt_chart, create_issue_summary_chart
 from data_handler import save_feedback, save_analysis_results, load_previous_analyses
 
@@ -18,6 +25,16 @@ from data_handler import save_feedback, save_analysis_results, load_previous_ana
 data_dir = Path("./data")
 data_dir.mkdir(exist_ok=True)
 
+# File extensions the analysis supports, hashed once at module scope so the
+# per-file filter is a single splitext plus an O(1) set lookup
+SUPPORTED_EXTS = frozenset((
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.go', '.rb', '.c', '.cpp', '.cs'
+))
+
+# Files under this size share one LLM request so the fixed prompt overhead is
+# paid once per batch instead of once per file
+SMALL_FILE_CHARS = 2000
+
 # App configuration
 st.set_page_config(
     page_title="AI-Augmented Code Review Assistant",
@@ -25,6 +42,274 @@ st.set_page_config(
     layout="wide"
 )
 
+def token_cache_key(token):
+    """Short digest of an API token, safe to use as part of a cache key."""
+    return hashlib.blake2b(token.encode(), digest_size=8).hexdigest()
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_github_pr_cached(repo, pr_number, token_hash, _github_token):
+    """
+    PR fetch memoized across Streamlit reruns.
+
+    The leading-underscore token is excluded from the cache key; token_hash
+    stands in for it so different users don't share entries.
+    """
+    return fetch_github_pr(repo, pr_number, _github_token)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def get_file_content_cached(repo, file_path, ref, token_hash, _github_token):
+    """File content fetch memoized across Streamlit reruns."""
+    return get_file_content(repo, file_path, ref, _github_token)
+
+@st.cache_data(show_spinner=False)
+def build_type_chart_spec(issue_records):
+    """Vega-Lite spec for the per-file issues-by-type bar chart."""
+    issue_df = pd.DataFrame(issue_records)
+    type_counts = issue_df["type"].value_counts().reset_index()
+    type_counts.columns = ["Type", "Count"]
+
+    return alt.Chart(type_counts).mark_bar().encode(
+        x="Type",
+        y="Count",
+        color="Type"
+    ).properties(
+        title="Issues by Type",
+        width=300
+    ).to_dict()
+
+@st.cache_data(show_spinner=False)
+def build_severity_chart_spec(issue_records):
+    """Vega-Lite spec for the per-file issues-by-severity bar chart."""
+    issue_df = pd.DataFrame(issue_records)
+    severity_counts = issue_df["severity"].value_counts().reset_index()
+    severity_counts.columns = ["Severity", "Count"]
+
+    return alt.Chart(severity_counts).mark_bar().encode(
+        x="Severity",
+        y="Count",
+        color=alt.Color("Severity", scale=alt.Scale(
+            domain=["error", "warning", "info"],
+            range=["red", "orange", "blue"]
+        ))
+    ).properties(
+        title="Issues by Severity",
+        width=300
+    ).to_dict()
+
+@st.cache_data(show_spinner=False)
+def build_breakdown_chart_spec(breakdown_records):
+    """Vega-Lite spec for the technical debt breakdown grouped bar chart."""
+    breakdown_df = pd.DataFrame(breakdown_records)
+
+    return alt.Chart(breakdown_df).mark_bar().encode(
+        x="File",
+        y="Score",
+        color="Category",
+        tooltip=["File", "Category", "Score"]
+    ).properties(
+        height=400
+    ).to_dict()
+
+@st.cache_data(show_spinner=False)
+def build_history_chart_spec(history_records, field, title):
+    """Vega-Lite spec for a historical metric line chart."""
+    history_df = pd.DataFrame(history_records)
+
+    return alt.Chart(history_df).mark_line().encode(
+        x="date",
+        y=field,
+        tooltip=["date", field, "pr_number"]
+    ).properties(
+        title=title,
+        width=400,
+        height=300
+    ).to_dict()
+
+def build_issues_index(issues):
+    """
+    Build a file-indexed DataFrame of issues for fast per-file slicing.
+
+    The Code Review tab reruns on every widget interaction; slicing a sorted
+    categorical index is O(issues in file) instead of rescanning every issue.
+    """
+    issues_df = pd.DataFrame(issues)
+    if issues_df.empty:
+        return issues_df
+    issues_df["file"] = issues_df["file"].astype("category")
+    # Small fixed vocabularies: categorical codes make value_counts and
+    # isin filters integer operations instead of string hashing. LLM
+    # severities are free-form, so anything outside the vocabulary is
+    # coerced to "info" (matching render_annotated_code's fallback)
+    # instead of becoming NaN and vanishing from charts and filters
+    severity = issues_df["severity"].where(
+        issues_df["severity"].isin(["error", "warning", "info"]), "info")
+    issues_df["severity"] = pd.Categorical(
+        severity, categories=["error", "warning", "info"], ordered=True)
+    issues_df["type"] = pd.Categorical(
+        issues_df["type"], categories=["static", "llm", "security"])
+    return issues_df.set_index("file").sort_index()
+
+def remap_issue_line(line, line_map):
+    """
+    Map a line number in reduced LLM content back to the full file.
+
+    line_map is None when the file was sent whole and numbers already match;
+    out-of-range lines are passed through unchanged.
+    """
+    if line_map is None:
+        return line
+    if isinstance(line, int) and 1 <= line <= len(line_map):
+        return line_map[line - 1]
+    return line
+
+@st.cache_resource(show_spinner=False)
+def run_analysis_pipeline(repo, pr_number, head_sha, use_static, use_llm,
+                          use_security, token_hash,
+                          _pr_data, _files_data, _github_token, _openai_api_key):
+    """
+    Run the full per-PR analysis, cached per configuration.
+
+    Keyed on the head commit SHA rather than the branch ref so force-pushes
+    invalidate stale results, while repeated "Run Analysis" clicks with the
+    same inputs return instantly. The underscore arguments (raw PR payloads
+    and secrets) are excluded from the cache key.
+    """
+    start_time = time.time()
+
+    # Select the files the analysis supports before fetching
+    all_issues = []
+    tech_debt_scores = {}
+
+    eligible_files = []
+    patch_by_file = {}
+    for file in _files_data:
+        filename = file["filename"]
+
+        # Skip very large files and binaries
+        if file.get("changes", 0) > 1000 or not file.get("patch"):
+            continue
+
+        # Check if file has a supported extension
+        if os.path.splitext(filename)[1] not in SUPPORTED_EXTS:
+            continue
+
+        eligible_files.append(filename)
+        patch_by_file[filename] = file["patch"]
+
+    # Fetch file contents concurrently: the GitHub round-trips are
+    # independent, so wall time is the slowest fetch rather than the sum.
+    # Fetch at the head commit SHA, not the branch name: the branch can
+    # move under the content cache's TTL, the SHA cannot
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        contents = list(executor.map(
+            lambda name: get_file_content_cached(
+                repo,
+                name,
+                head_sha,
+                token_hash,
+                _github_token
+            ),
+            eligible_files
+        ))
+
+    code_contents = {
+        name: content
+        for name, content in zip(eligible_files, contents)
+        if content
+    }
+    total_bytes = sum(len(content) for content in code_contents.values())
+
+    # Run LLM analysis if enabled: small files share batched prompts,
+    # large files get concurrent per-file calls
+    llm_results_by_file = {}
+    line_map_by_file = {}
+    if use_llm and _openai_api_key:
+        small_files = []
+        large_files = []
+        for name, content in code_contents.items():
+            # Review only the changed regions plus context; static
+            # analysis below still sees the full file. The line map
+            # translates issue lines in the snippet back to the full file
+            llm_content, line_map = extract_patch_context_with_map(
+                content, patch_by_file.get(name))
+            if line_map is not None:
+                line_map_by_file[name] = line_map
+            if len(llm_content) < SMALL_FILE_CHARS:
+                small_files.append((name, llm_content))
+            else:
+                large_files.append((name, llm_content))
+
+        if small_files:
+            llm_results_by_file.update(run_llm_analysis_batch(
+                small_files,
+                _openai_api_key
+            ))
+        if large_files:
+            llm_results_by_file.update(run_llm_analysis_many(
+                large_files,
+                _openai_api_key
+            ))
+
+    # Run static analysis over the whole batch in one call if enabled:
+    # one invocation per linter instead of one per file
+    static_by_file = {}
+    if use_static:
+        static_by_file = run_static_analysis_batch(list(code_contents.items()))
+
+    for filename, content in code_contents.items():
+        file_issues = []
+
+        # Merge in the static analysis results for this file
+        file_issues.extend([{
+            "file": filename,
+            "type": "static",
+            "line": issue.get("line", 0),
+            "message": issue.get("message", ""),
+            "severity": issue.get("severity", "info")
+        } for issue in static_by_file.get(filename, [])])
+
+        # Merge in the LLM results for this file, mapping line numbers in
+        # reduced snippets back to the full file
+        line_map = line_map_by_file.get(filename)
+        file_issues.extend([{
+            "file": filename,
+            "type": "llm",
+            "line": remap_issue_line(issue.get("line", 0), line_map),
+            "message": issue.get("message", ""),
+            "severity": issue.get("severity", "info"),
+            "suggested_fix": issue.get("fix", "")
+        } for issue in llm_results_by_file.get(filename, [])])
+
+        # Calculate technical debt score
+        tech_debt, debt_details = calculate_tech_debt_score(content, filename, file_issues)
+        tech_debt_scores[filename] = {
+            "overall": tech_debt,
+            "details": debt_details
+        }
+
+        # Add to all issues
+        all_issues.extend(file_issues)
+
+    # Store only the analyzed file names, not their contents: the sources
+    # would bloat session state and the on-disk dump, and Tab 1 can re-fetch
+    # the one file being viewed through the content cache
+    analysis_results = {
+        "pr_data": _pr_data,
+        "files_data": _files_data,
+        "issues": all_issues,
+        "tech_debt_scores": tech_debt_scores,
+        "analyzed_files": list(code_contents),
+        "total_bytes": total_bytes,
+        "total_issues": len(all_issues),
+        "review_time": time.time() - start_time
+    }
+
+    # Save analysis results to file; runs only on cache misses, so repeat
+    # clicks don't append duplicate history entries
+    save_analysis_results(repo, pr_number, analysis_results)
+
+    return analysis_results
+
 # Application state
 if 'authenticated' not in st.session_state:
     st.session_state.authenticated = False
@@ -76,9 +361,15 @@ with st.sidebar:
         st.header("Analysis Configuration")
         
         use_static = st.checkbox("Static Analysis", value=True)
-        use_llm = st.checkbox("LLM Analysis", value=True, 
+        use_llm = st.checkbox("LLM Analysis", value=True,
                            help="Uses OpenAI API to analyze code semantically")
         use_security = st.checkbox("Security Analysis", value=True)
+
+        requests_per_minute = st.number_input(
+            "OpenAI requests per minute",
+            min_value=1, max_value=10000, value=500,
+            help="Match this to your OpenAI account's rate limit tier"
+        )
         
         # Run analysis button
         if st.button("Run Analysis"):
@@ -88,6 +379,9 @@ with st.sidebar:
                 else:
                     # Record start time for metrics
                     st.session_state.review_start_time = time.time()
+
+                    # Apply the configured API rate budget
+                    set_llm_rate_limit(requests_per_minute)
                     
                     # Store configuration
                     st.session_state.current_repo = repo
@@ -117,99 +411,37 @@ else:
     if st.session_state.analysis_results is None:
         with st.spinner("Running AI analysis on the pull request..."):
             try:
-                # Fetch PR data
-                pr_data, files_data = fetch_github_pr(
-                    st.session_state.current_repo, 
+                # Fetch PR data, memoized across reruns
+                token_hash = token_cache_key(st.session_state.github_token)
+                pr_data, files_data = fetch_github_pr_cached(
+                    st.session_state.current_repo,
                     st.session_state.current_pr,
+                    token_hash,
                     st.session_state.github_token
                 )
-                
+
                 if not pr_data or not files_data:
                     st.error("Failed to fetch PR data. Please check repository and PR number.")
                     st.stop()
-                
-                # Process each file in the PR
-                all_issues = []
-                tech_debt_scores = {}
-                code_contents = {}
-                
-                for file in files_data:
-                    filename = file["filename"]
-                    
-                    # Skip very large files and binaries
-                    if file.get("changes", 0) > 1000 or not file.get("patch"):
-                        continue
-                    
-                    # Check if file has a supported extension
-                    supported_extensions = ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.go', '.rb', '.c', '.cpp', '.cs']
-                    if not any(filename.endswith(ext) for ext in supported_extensions):
-                        continue
-                    
-                    # Get file content
-                    content = get_file_content(
-                        st.session_state.current_repo,
-                        filename,
-                        pr_data["head"]["ref"],
-                        st.session_state.github_token
-                    )
-                    
-                    if content:
-                        code_contents[filename] = content
-                        file_issues = []
-                        
-                        # Run static analysis if enabled
-                        if st.session_state.use_static:
-                            static_results = run_static_analysis(content, filename)
-                            file_issues.extend([{
-                                "file": filename,
-                                "type": "static",
-                                "line": issue.get("line", 0),
-                                "message": issue.get("message", ""),
-                                "severity": issue.get("severity", "info")
-                            } for issue in static_results])
-                        
-                        # Run LLM analysis if enabled
-                        if st.session_state.use_llm and hasattr(st.session_state, 'openai_api_key'):
-                            llm_results = run_llm_analysis(content, filename, st.session_state.openai_api_key)
-                            file_issues.extend([{
-                                "file": filename,
-                                "type": "llm",
-                                "line": issue.get("line", 0),
-                                "message": issue.get("message", ""),
-                                "severity": issue.get("severity", "info"),
-                                "suggested_fix": issue.get("fix", "")
-                            } for issue in llm_results])
-                        
-                        # Calculate technical debt score
-                        tech_debt, debt_details = calculate_tech_debt_score(content, filename, file_issues)
-                        tech_debt_scores[filename] = {
-                            "overall": tech_debt,
-                            "details": debt_details
-                        }
-                        
-                        # Add to all issues
-                        all_issues.extend(file_issues)
-                
-                # Calculate review time
-                review_time = time.time() - st.session_state.review_start_time
-                
-                # Store results in session state
-                st.session_state.analysis_results = {
-                    "pr_data": pr_data,
-                    "files_data": files_data,
-                    "issues": all_issues,
-                    "tech_debt_scores": tech_debt_scores,
-                    "code_contents": code_contents,
-                    "review_time": review_time
-                }
-                
-                # Save analysis results to file
-                save_analysis_results(
+
+                st.session_state.analysis_results = run_analysis_pipeline(
                     st.session_state.current_repo,
                     st.session_state.current_pr,
-                    st.session_state.analysis_results
+                    pr_data["head"]["sha"],
+                    st.session_state.use_static,
+                    st.session_state.use_llm and hasattr(st.session_state, 'openai_api_key'),
+                    st.session_state.use_security,
+                    token_hash,
+                    pr_data,
+                    files_data,
+                    st.session_state.github_token,
+                    getattr(st.session_state, 'openai_api_key', '')
                 )
-                
+
+                # Index the issues by file once for the Code Review tab
+                st.session_state.issues_df = build_issues_index(
+                    st.session_state.analysis_results["issues"])
+
             except Exception as e:
                 st.error(f"Error during analysis: {str(e)}")
                 st.stop()
@@ -221,58 +453,49 @@ else:
         results = st.session_state.analysis_results
         
         # File selection dropdown
-        file_list = list(results["code_contents"].keys())
+        file_list = results["analyzed_files"]
         if file_list:
             selected_file = st.selectbox("Select File to Review", file_list)
-            
-            # Get file content and issues
-            code_content = results["code_contents"][selected_file]
-            file_issues = [issue for issue in results["issues"] if issue["file"] == selected_file]
-            
+
+            # Re-fetch the selected file through the content cache; only the
+            # file being viewed costs a (memoized) request. Pinned to the
+            # analyzed head SHA so the view matches the annotations even if
+            # the branch has moved since
+            code_content = get_file_content_cached(
+                st.session_state.current_repo,
+                selected_file,
+                results["pr_data"]["head"]["sha"],
+                token_cache_key(st.session_state.github_token),
+                st.session_state.github_token
+            ) or ""
+
+            if 'issues_df' not in st.session_state:
+                st.session_state.issues_df = build_issues_index(results["issues"])
+            issues_df = st.session_state.issues_df
+
+            if not issues_df.empty and selected_file in issues_df.index:
+                issue_df = issues_df.loc[[selected_file]]
+            else:
+                issue_df = issues_df.iloc[0:0]
+            file_issues = issue_df.reset_index().to_dict("records")
+
             # Render code with annotations
             render_annotated_code(code_content, file_issues, selected_file)
-            
+
             # Issue summary
             st.subheader("Issue Summary")
             if file_issues:
-                # Create a DataFrame for the issues
-                issue_df = pd.DataFrame(file_issues)
-                
+
                 # Display issue counts by type and severity
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    type_counts = issue_df["type"].value_counts().reset_index()
-                    type_counts.columns = ["Type", "Count"]
-                    
-                    type_chart = alt.Chart(type_counts).mark_bar().encode(
-                        x="Type",
-                        y="Count",
-                        color="Type"
-                    ).properties(
-                        title="Issues by Type",
-                        width=300
-                    )
-                    
-                    st.altair_chart(type_chart, use_container_width=True)
-                
+                    st.vega_lite_chart(build_type_chart_spec(file_issues),
+                                       use_container_width=True)
+
                 with col2:
-                    severity_counts = issue_df["severity"].value_counts().reset_index()
-                    severity_counts.columns = ["Severity", "Count"]
-                    
-                    severity_chart = alt.Chart(severity_counts).mark_bar().encode(
-                        x="Severity",
-                        y="Count",
-                        color=alt.Color("Severity", scale=alt.Scale(
-                            domain=["error", "warning", "info"],
-                            range=["red", "orange", "blue"]
-                        ))
-                    ).properties(
-                        title="Issues by Severity",
-                        width=300
-                    )
-                    
-                    st.altair_chart(severity_chart, use_container_width=True)
+                    st.vega_lite_chart(build_severity_chart_spec(file_issues),
+                                       use_container_width=True)
                 
                 # Display issue table with filtering
                 st.subheader("Issues")
@@ -342,9 +565,11 @@ else:
             categories = set()
             
             for filename, data in tech_debt_scores.items():
+                # Just the filename without path, computed once per file
+                basename = filename.rsplit("/", 1)[-1]
                 for category, score in data["details"].items():
                     breakdown_data.append({
-                        "File": filename.split("/")[-1],  # Just the filename without path
+                        "File": basename,
                         "Category": category.replace("_", " ").title(),
                         "Score": score
                     })
@@ -352,18 +577,10 @@ else:
             
             if breakdown_data:
                 breakdown_df = pd.DataFrame(breakdown_data)
-                
-                # Create a grouped bar chart
-                breakdown_chart = alt.Chart(breakdown_df).mark_bar().encode(
-                    x="File",
-                    y="Score",
-                    color="Category",
-                    tooltip=["File", "Category", "Score"]
-                ).properties(
-                    height=400
-                )
-                
-                st.altair_chart(breakdown_chart, use_container_width=True)
+
+                # Grouped bar chart, built once per analysis via the cache
+                st.vega_lite_chart(build_breakdown_chart_spec(breakdown_data),
+                                   use_container_width=True)
                 
                 # Recommendations based on debt
                 st.subheader("Recommendations")
@@ -429,10 +646,11 @@ else:
         
         results = st.session_state.analysis_results
         
-        # Calculate current metrics
-        total_issues = len(results["issues"])
+        # Current metrics, precomputed when the analysis was stored
+        total_issues = results.get("total_issues", len(results["issues"]))
         review_time_mins = results["review_time"] / 60
-        issue_density = total_issues / max(1, sum(len(content) for content in results["code_contents"].values()) / 1000)
+        total_bytes = results.get("total_bytes", 0)
+        issue_density = total_issues / max(1, total_bytes / 1000)
         
         # Display current metrics
         col1, col2, col3 = st.columns(3)
@@ -471,30 +689,18 @@ else:
             col1, col2 = st.columns(2)
             
             with col1:
-                issues_chart = alt.Chart(history_df).mark_line().encode(
-                    x="date",
-                    y="issue_count",
-                    tooltip=["date", "issue_count", "pr_number"]
-                ).properties(
-                    title="Issues Found Over Time",
-                    width=400,
-                    height=300
+                st.vega_lite_chart(
+                    build_history_chart_spec(historical_data, "issue_count",
+                                             "Issues Found Over Time"),
+                    use_container_width=True
                 )
-                
-                st.altair_chart(issues_chart, use_container_width=True)
-            
+
             with col2:
-                time_chart = alt.Chart(history_df).mark_line().encode(
-                    x="date",
-                    y="review_time_mins",
-                    tooltip=["date", "review_time_mins", "pr_number"]
-                ).properties(
-                    title="Review Time Over Time",
-                    width=400,
-                    height=300
+                st.vega_lite_chart(
+                    build_history_chart_spec(historical_data, "review_time_mins",
+                                             "Review Time Over Time"),
+                    use_container_width=True
                 )
-                
-                st.altair_chart(time_chart, use_container_width=True)
             
             # Calculate averages
             avg_issues = history_df["issue_count"].mean()
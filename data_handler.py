@@ -1,13 +1,116 @@
 import json
 import os
+import sqlite3
 import datetime
+import concurrent.futures
+import numpy as np
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+# Optional: orjson serializes and parses JSON several times faster than the
+# stdlib, which matters for the post-analysis save that blocks the UI spinner
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Create data directory if it doesn't exist
 data_dir = Path("./data")
 data_dir.mkdir(exist_ok=True)
 
+# These files are only round-tripped by the load_* functions, so they are
+# written compact; set ACMRS_PRETTY_JSON=1 to indent them for hand reading
+_PRETTY_JSON = os.environ.get("ACMRS_PRETTY_JSON") == "1"
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to JSON bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if _PRETTY_JSON else 0)
+    if _PRETTY_JSON:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj).encode('utf-8')
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dump_line(obj: Any) -> bytes:
+    """Serialize an object to one newline-terminated JSON Lines record."""
+    if orjson is not None:
+        return orjson.dumps(obj) + b'\n'
+    return (json.dumps(obj) + '\n').encode('utf-8')
+
+def _atomic_write(filepath: Path, data: bytes) -> None:
+    """
+    Write bytes to a file through a temp file and an atomic rename.
+
+    A crash mid-write leaves either the old file or the new one, never a
+    truncated mix; no fsync, since these files are rebuildable caches.
+
+    Args:
+        filepath: Destination path
+        data: Serialized bytes to write
+    """
+    temp_path = filepath.with_name(filepath.name + ".tmp")
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, filepath)
+
+# Summary store: append-only JSON Lines, plus the legacy list-format file
+# which is still read (and absorbed on the next prune) if present
+_summary_jsonl_file = data_dir / "analysis_summary.jsonl"
+_legacy_summary_file = data_dir / "analysis_summary.json"
+
+# Catalog of saved analysis and feedback files: lookups become indexed
+# SELECTs instead of globbing and stat-ing every file in the data directory
+_index_path = data_dir / "index.db"
+_index_connection: Optional[sqlite3.Connection] = None
+
+def _get_index() -> sqlite3.Connection:
+    """Open the file catalog lazily, creating the schema on first use."""
+    global _index_connection
+
+    if _index_connection is None:
+        _index_connection = sqlite3.connect(
+            str(_index_path),
+            isolation_level=None,
+            check_same_thread=False
+        )
+        _index_connection.execute("PRAGMA journal_mode=WAL")
+        _index_connection.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "filepath TEXT PRIMARY KEY, "
+            "repo TEXT NOT NULL, "
+            "pr_number TEXT NOT NULL, "
+            "mtime REAL NOT NULL)"
+        )
+        _index_connection.execute(
+            "CREATE TABLE IF NOT EXISTS feedback ("
+            "filepath TEXT PRIMARY KEY, "
+            "repo TEXT NOT NULL, "
+            "pr_number TEXT NOT NULL, "
+            "mtime REAL NOT NULL)"
+        )
+        _index_connection.execute(
+            "CREATE INDEX IF NOT EXISTS analyses_repo_pr ON analyses (repo, pr_number)")
+        _index_connection.execute(
+            "CREATE INDEX IF NOT EXISTS feedback_repo_pr ON feedback (repo, pr_number)")
+
+    return _index_connection
+
+def _index_file(table: str, filepath: Path, repo: str, pr_number: str) -> None:
+    """Record a saved file in the catalog; failures only cost the index."""
+    try:
+        _get_index().execute(
+            f"INSERT OR REPLACE INTO {table} (filepath, repo, pr_number, mtime) "
+            "VALUES (?, ?, ?, ?)",
+            (str(filepath), repo, str(pr_number), filepath.stat().st_mtime)
+        )
+    except Exception as e:
+        print(f"Error updating {table} index: {str(e)}")
+
 def save_feedback(feedback: Dict[str, Any]) -> bool:
     """
     Save developer feedback to file.
@@ -28,9 +131,10 @@ def save_feedback(feedback: Dict[str, Any]) -> bool:
         filepath = data_dir / filename
         
         # Save the feedback data
-        with open(filepath, 'w') as f:
-            json.dump(feedback, f, indent=2)
-        
+        _atomic_write(filepath, _dumps(feedback))
+
+        _index_file("feedback", filepath, feedback.get("repository", ""), pr_number)
+
         return True
     except Exception as e:
         print(f"Error saving feedback: {str(e)}")
@@ -68,10 +172,11 @@ def save_analysis_results(repo: str, pr_number: str, results: Dict[str, Any]) ->
         
         filename = f"analysis_{repo_sanitized}_{pr_number}_{timestamp}.json"
         filepath = data_dir / filename
-        
+
         # Save the results
-        with open(filepath, 'w') as f:
-            json.dump(simplified_results, f, indent=2)
+        _atomic_write(filepath, _dumps(simplified_results))
+
+        _index_file("analyses", filepath, repo, pr_number)
             
         # Also save to a summary file for quick loading
         save_analysis_summary(simplified_results)
@@ -92,17 +197,6 @@ def save_analysis_summary(analysis: Dict[str, Any]) -> bool:
         True if successful, False otherwise
     """
     try:
-        summary_file = data_dir / "analysis_summary.json"
-        
-        # Load existing summary if available
-        summary_data = []
-        if summary_file.exists():
-            try:
-                with open(summary_file, 'r') as f:
-                    summary_data = json.load(f)
-            except:
-                summary_data = []
-        
         # Create summary entry
         summary_entry = {
             "repo": analysis.get("repo", ""),
@@ -112,14 +206,12 @@ def save_analysis_summary(analysis: Dict[str, Any]) -> bool:
             "review_time_mins": analysis.get("review_time_mins", 0),
             "tech_debt_avg": calculate_avg_tech_debt(analysis.get("tech_debt_scores", {}))
         }
-        
-        # Add to summary data
-        summary_data.append(summary_entry)
-        
-        # Save updated summary
-        with open(summary_file, 'w') as f:
-            json.dump(summary_data, f, indent=2)
-            
+
+        # One appended line per analysis: no read, parse, or rewrite of the
+        # existing entries, so the write cost stays constant as history grows
+        with open(_summary_jsonl_file, 'ab') as f:
+            f.write(_dump_line(summary_entry))
+
         return True
     except Exception as e:
         print(f"Error saving analysis summary: {str(e)}")
@@ -137,36 +229,81 @@ def calculate_avg_tech_debt(tech_debt_scores: Dict[str, Any]) -> float:
     """
     if not tech_debt_scores:
         return 0.0
-    
-    total = sum(score.get("overall", 0) for score in tech_debt_scores.values())
-    return total / len(tech_debt_scores)
+
+    # fromiter fills a preallocated array straight from the generator, so
+    # the mean runs vectorized instead of boxing each score through sum()
+    values = np.fromiter(
+        (score.get("overall", 0) for score in tech_debt_scores.values()),
+        dtype=np.float64,
+        count=len(tech_debt_scores)
+    )
+    return float(values.mean())
+
+# Parsed summary memo keyed on the file's (mtime, size): Metrics tab reruns
+# skip re-reading and re-parsing an unchanged summary
+_summary_cache: Dict[str, Any] = {}
+
+def _load_summary_data() -> List[Dict[str, Any]]:
+    """Read all summary entries, memoized while the files are unchanged."""
+    key = []
+    for path in (_legacy_summary_file, _summary_jsonl_file):
+        if path.exists():
+            stat = path.stat()
+            key.append((path.name, stat.st_mtime_ns, stat.st_size))
+    key = tuple(key)
+
+    if not key:
+        return []
+
+    if _summary_cache.get("key") != key:
+        entries: List[Dict[str, Any]] = []
+
+        if _legacy_summary_file.exists():
+            try:
+                entries.extend(_loads(_legacy_summary_file.read_bytes()))
+            except:
+                pass
+
+        if _summary_jsonl_file.exists():
+            with open(_summary_jsonl_file, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entries.append(_loads(line))
+                    except:
+                        # Skip lines that can't be parsed
+                        continue
+
+        _summary_cache["data"] = entries
+        _summary_cache["key"] = key
+
+    return _summary_cache["data"]
 
 def load_previous_analyses(repo: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Load previous analysis summaries, optionally filtered by repository.
-    
+
     Args:
         repo: Repository name to filter by (optional)
-        
+
     Returns:
         List of analysis summary entries
     """
     try:
-        summary_file = data_dir / "analysis_summary.json"
-        
-        if not summary_file.exists():
-            return []
-        
-        with open(summary_file, 'r') as f:
-            summary_data = json.load(f)
-        
-        # Filter by repository if specified
+        summary_data = _load_summary_data()
+
+        # Filter by repository if specified; always build a new list so the
+        # sort below can't reorder the memoized copy
         if repo:
             summary_data = [entry for entry in summary_data if entry.get("repo") == repo]
-        
+        else:
+            summary_data = list(summary_data)
+
         # Sort by date
         summary_data.sort(key=lambda x: x.get("date", ""), reverse=True)
-        
+
         return summary_data
     except Exception as e:
         print(f"Error loading previous analyses: {str(e)}")
@@ -184,29 +321,56 @@ def load_feedback(repo: Optional[str] = None, pr_number: Optional[str] = None) -
         List of feedback data
     """
     try:
-        feedback_files = list(data_dir.glob("feedback_*.json"))
-        
+        # Push the filters into the catalog so non-matching files are never
+        # opened; files saved before the catalog existed are still globbed
+        # and filtered after parsing
+        try:
+            index = _get_index()
+            repo_param = repo or ""
+            pr_param = str(pr_number) if pr_number else ""
+            rows = index.execute(
+                "SELECT filepath FROM feedback "
+                "WHERE (?='' OR repo=?) AND (?='' OR pr_number=?)",
+                (repo_param, repo_param, pr_param, pr_param)
+            ).fetchall()
+            cataloged = {row[0] for row in index.execute(
+                "SELECT filepath FROM feedback").fetchall()}
+
+            feedback_files = [Path(row[0]) for row in rows if Path(row[0]).exists()]
+            feedback_files += [file for file in data_dir.glob("feedback_*.json")
+                               if str(file) not in cataloged]
+        except Exception as e:
+            print(f"Error querying feedback index: {str(e)}")
+            feedback_files = list(data_dir.glob("feedback_*.json"))
+
         if not feedback_files:
             return []
         
-        feedback_data = []
-        
-        for file in feedback_files:
+        def _read(file: Path) -> Optional[Dict[str, Any]]:
             try:
-                with open(file, 'r') as f:
-                    data = json.load(f)
-                
-                # Apply filters if specified
-                if repo and data.get("repository") != repo:
-                    continue
-                
-                if pr_number and str(data.get("pr_number")) != str(pr_number):
-                    continue
-                
-                feedback_data.append(data)
+                return _loads(file.read_bytes())
             except:
                 # Skip files that can't be parsed
+                return None
+
+        # The reads are independent small files, so overlap them on a pool
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+            loaded = list(executor.map(_read, feedback_files))
+
+        feedback_data = []
+
+        for data in loaded:
+            if data is None:
+                continue
+
+            # Apply filters if specified
+            if repo and data.get("repository") != repo:
+                continue
+
+            if pr_number and str(data.get("pr_number")) != str(pr_number):
                 continue
+
+            feedback_data.append(data)
         
         # Sort by timestamp
         feedback_data.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
@@ -228,17 +392,29 @@ def get_detailed_analysis(repo: str, pr_number: str) -> Optional[Dict[str, Any]]
         Detailed analysis data or None if not found
     """
     try:
+        # One indexed lookup instead of globbing and stat-ing every file
+        try:
+            row = _get_index().execute(
+                "SELECT filepath FROM analyses WHERE repo=? AND pr_number=? "
+                "ORDER BY mtime DESC LIMIT 1",
+                (repo, str(pr_number))
+            ).fetchone()
+            if row is not None and Path(row[0]).exists():
+                return _loads(Path(row[0]).read_bytes())
+        except Exception as e:
+            print(f"Error querying analyses index: {str(e)}")
+
+        # Fall back to scanning for files saved before the catalog existed
         repo_sanitized = repo.replace("/", "_")
         analysis_files = list(data_dir.glob(f"analysis_{repo_sanitized}_{pr_number}_*.json"))
-        
+
         if not analysis_files:
             return None
-        
+
         # Get the most recent analysis
         latest_file = max(analysis_files, key=lambda x: x.stat().st_mtime)
-        
-        with open(latest_file, 'r') as f:
-            return json.load(f)
+
+        return _loads(latest_file.read_bytes())
     except Exception as e:
         print(f"Error getting detailed analysis: {str(e)}")
         return None
@@ -256,37 +432,62 @@ def delete_old_data(days: int = 30) -> bool:
     try:
         # Calculate the cutoff date
         cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days)
-        
-        # Find all JSON files in the data directory
-        data_files = list(data_dir.glob("*.json"))
-        
-        for file in data_files:
-            # Skip the summary file
-            if file.name == "analysis_summary.json":
-                continue
-            
-            # Check file modification time
-            mod_time = datetime.datetime.fromtimestamp(file.stat().st_mtime)
-            
-            if mod_time < cutoff_date:
-                # Delete the file
-                file.unlink()
-        
-        # Update the summary file to remove old entries
-        summary_file = data_dir / "analysis_summary.json"
-        
-        if summary_file.exists():
-            with open(summary_file, 'r') as f:
-                summary_data = json.load(f)
-            
-            # Filter out old entries
-            cutoff_str = cutoff_date.isoformat()
-            summary_data = [entry for entry in summary_data if entry.get("date", "") >= cutoff_str]
-            
-            # Save updated summary
-            with open(summary_file, 'w') as f:
-                json.dump(summary_data, f, indent=2)
-        
+        cutoff_ts = cutoff_date.timestamp()
+
+        # Scan the data directory once: DirEntry carries the stat result
+        # from the directory listing, so no extra stat call per file and no
+        # datetime allocation in the loop
+        with os.scandir(data_dir) as entries_it:
+            for entry in entries_it:
+                # Skip the summary file
+                if not entry.name.endswith(".json") or entry.name == "analysis_summary.json":
+                    continue
+
+                # Check file modification time
+                if entry.is_file() and entry.stat().st_mtime < cutoff_ts:
+                    # Delete the file
+                    os.unlink(entry.path)
+
+        # Drop catalog rows for files that no longer exist
+        try:
+            index = _get_index()
+            index.execute("DELETE FROM analyses WHERE mtime < ?", (cutoff_ts,))
+            index.execute("DELETE FROM feedback WHERE mtime < ?", (cutoff_ts,))
+        except Exception as e:
+            print(f"Error pruning file index: {str(e)}")
+
+        # Prune the summary: stream surviving entries into a temp file and
+        # swap it in atomically; any legacy list-format summary is absorbed
+        # into the JSON Lines file here
+        cutoff_str = cutoff_date.isoformat()
+        temp_file = _summary_jsonl_file.with_name("analysis_summary.jsonl.tmp")
+
+        if _legacy_summary_file.exists():
+            # Legacy list format has to be decoded in full once to convert it
+            entries = _load_summary_data()
+            if entries:
+                with open(temp_file, 'wb') as f:
+                    for entry in entries:
+                        if entry.get("date", "") >= cutoff_str:
+                            f.write(_dump_line(entry))
+                os.replace(temp_file, _summary_jsonl_file)
+            _legacy_summary_file.unlink()
+        elif _summary_jsonl_file.exists():
+            # Filter line by line: kept records are copied through as raw
+            # bytes, so the summary is never re-serialized or held in RAM
+            with open(_summary_jsonl_file, 'rb') as reader, \
+                    open(temp_file, 'wb') as writer:
+                for line in reader:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = _loads(line)
+                    except (ValueError, TypeError):
+                        continue
+                    if entry.get("date", "") >= cutoff_str:
+                        writer.write(line)
+            os.replace(temp_file, _summary_jsonl_file)
+
         return True
     except Exception as e:
         print(f"Error deleting old data: {str(e)}")
@@ -1,44 +1,146 @@
+import re
 import requests
-import base64
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any, Optional
 
+# One session for all GitHub calls: HTTP keep-alive reuses the TLS
+# connection across requests instead of paying the handshake every time
+_session = requests.Session()
+
+@lru_cache(maxsize=8)
+def _get_headers(github_token: str) -> Dict[str, str]:
+    """Build the standard GitHub API headers once per token."""
+    return {
+        "Authorization": f"token {github_token}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+
+# Unified diff hunk header: captures the new-file start line and line count
+_HUNK_HEADER_RE = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@', re.MULTILINE)
+
+# GET responses cached by URL with their ETag: GitHub answers a matching
+# If-None-Match with 304 and an empty body, and 304s do not count against
+# the API rate limit, so repeat views of the same PR are nearly free.
+# Callers fetch on thread pools, so every access holds the lock
+_etag_cache: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+_etag_lock = threading.Lock()
+_ETAG_CACHE_SIZE = 256
+
+def _cached_get(url: str, headers: Dict[str, str], raw: bool = False) -> Tuple[int, Any, str]:
+    """
+    GET a GitHub API URL with ETag revalidation.
+
+    Args:
+        url: Full API URL to fetch
+        headers: Request headers (not mutated)
+        raw: Return the response body as text instead of parsed JSON
+
+    Returns:
+        Tuple of (status code, payload or None, error text)
+    """
+    cache_key = f"raw:{url}" if raw else url
+
+    with _etag_lock:
+        cached = _etag_cache.get(cache_key)
+    if cached is not None:
+        headers = dict(headers)
+        headers["If-None-Match"] = cached[0]
+
+    response = _session.get(url, headers=headers)
+
+    if response.status_code == 304 and cached is not None:
+        with _etag_lock:
+            # The entry may have been evicted by another thread meanwhile
+            if cache_key in _etag_cache:
+                _etag_cache.move_to_end(cache_key)
+        return 200, cached[1], ""
+
+    if response.status_code != 200:
+        return response.status_code, None, response.text
+
+    payload = response.text if raw else response.json()
+    etag = response.headers.get("ETag")
+    if etag:
+        with _etag_lock:
+            _etag_cache[cache_key] = (etag, payload)
+            _etag_cache.move_to_end(cache_key)
+            while len(_etag_cache) > _ETAG_CACHE_SIZE:
+                _etag_cache.popitem(last=False)
+
+    return 200, payload, ""
+
+def iter_pr_files(repo: str, pr_number: str, github_token: str,
+                  per_page: int = 100):
+    """
+    Yield the files of a pull request page by page.
+
+    The files endpoint caps each response at a page of entries (30 by
+    default), so large PRs have to be walked; yielding each page as it
+    arrives lets callers start work before the full listing is in.
+
+    Args:
+        repo: Repository in format 'owner/name'
+        pr_number: Pull request number
+        github_token: GitHub API token
+        per_page: Page size to request (GitHub caps this at 100)
+
+    Yields:
+        File entry dictionaries as returned by the API
+    """
+    headers = _get_headers(github_token)
+    files_url = f"https://api.github.com/repos/{repo}/pulls/{pr_number}/files"
+    page = 1
+
+    while True:
+        status, batch, error = _cached_get(
+            f"{files_url}?per_page={per_page}&page={page}", headers)
+
+        if status != 200:
+            print(f"Error fetching PR files (page {page}): {status} - {error}")
+            return
+
+        for entry in batch:
+            yield entry
+
+        if len(batch) < per_page:
+            return
+        page += 1
+
 def fetch_github_pr(repo: str, pr_number: str, github_token: str) -> Tuple[Optional[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
     """
     Fetch pull request data from GitHub API.
-    
+
     Args:
         repo: Repository in format 'owner/name'
         pr_number: Pull request number
         github_token: GitHub API token
-        
+
     Returns:
         Tuple of (PR data, PR files)
     """
-    headers = {
-        "Authorization": f"token {github_token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    
-    # Get PR details
+    headers = _get_headers(github_token)
+
+    # The PR details and files listing are independent endpoints, so
+    # fetch both at once instead of paying two round-trips in sequence
     pr_url = f"https://api.github.com/repos/{repo}/pulls/{pr_number}"
-    pr_response = requests.get(pr_url, headers=headers)
-    
-    if pr_response.status_code != 200:
-        print(f"Error fetching PR: {pr_response.status_code} - {pr_response.text}")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        pr_future = executor.submit(_cached_get, pr_url, headers)
+        files_future = executor.submit(
+            lambda: list(iter_pr_files(repo, pr_number, github_token)))
+        status, pr_data, error = pr_future.result()
+        files_data = files_future.result()
+
+    if status != 200:
+        print(f"Error fetching PR: {status} - {error}")
         return None, None
-    
-    pr_data = pr_response.json()
-    
-    # Get PR files
-    files_url = f"{pr_url}/files"
-    files_response = requests.get(files_url, headers=headers)
-    
-    if files_response.status_code != 200:
-        print(f"Error fetching PR files: {files_response.status_code} - {files_response.text}")
+
+    if not files_data:
         return pr_data, None
-    
-    files_data = files_response.json()
-    
+
     return pr_data, files_data
 
 def get_file_content(repo: str, file_path: str, ref: str, github_token: str) -> Optional[str]:
@@ -54,35 +156,101 @@ def get_file_content(repo: str, file_path: str, ref: str, github_token: str) ->
     Returns:
         File content as string
     """
-    headers = {
-        "Authorization": f"token {github_token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    
+    # The raw media type makes the response body the file itself, skipping
+    # the JSON metadata envelope and its base64-inflated content field
+    headers = dict(_get_headers(github_token))
+    headers["Accept"] = "application/vnd.github.v3.raw"
+
     url = f"https://api.github.com/repos/{repo}/contents/{file_path}?ref={ref}"
-    response = requests.get(url, headers=headers)
-    
-    if response.status_code != 200:
-        print(f"Error fetching file content: {response.status_code} - {response.text}")
+    status, content, error = _cached_get(url, headers, raw=True)
+
+    if status != 200:
+        print(f"Error fetching file content: {status} - {error}")
         return None
-    
-    try:
-        content_data = response.json()
-        
-        # Check if the response is a file (not a directory)
-        if isinstance(content_data, dict) and "content" in content_data:
-            content = content_data["content"]
-            # GitHub returns content as base64 encoded
-            decoded_content = base64.b64decode(content).decode("utf-8")
-            return decoded_content
+
+    return content
+
+def extract_patch_context_with_map(content: str, patch: Optional[str],
+                                   context_lines: int = 20) -> Tuple[str, Optional[List[int]]]:
+    """
+    Reduce file content to the regions a PR patch touches, plus context.
+
+    Sending whole files to the LLM wastes tokens on unmodified code; the
+    hunk headers in the patch give the changed line ranges, so only those
+    ranges (with surrounding context) need reviewing. Because the reduced
+    snippet renumbers the lines, the line map lets callers translate issue
+    line numbers back to positions in the full file.
+
+    Args:
+        content: Full file content at the PR head
+        patch: Unified diff for the file from the PR files listing
+        context_lines: Lines of context to keep around each changed range
+
+    Returns:
+        Tuple of (reduced content, line map). The line map gives the
+        original 1-based line number for each line of the reduced content,
+        with 0 for separator lines; it is None when the content is returned
+        whole and line numbers already match.
+    """
+    if not patch:
+        return content, None
+
+    lines = content.splitlines()
+    total_lines = len(lines)
+    if total_lines == 0:
+        return content, None
+
+    # Collect changed line ranges from the hunk headers
+    ranges = []
+    changed_lines = 0
+    for match in _HUNK_HEADER_RE.finditer(patch):
+        start = int(match.group(1))
+        count = int(match.group(2) or 1)
+        changed_lines += count
+        low = max(0, start - 1 - context_lines)
+        high = min(total_lines, start - 1 + count + context_lines)
+        ranges.append((low, high))
+
+    # Whole-file review is clearer when most of the file changed anyway
+    if not ranges or changed_lines * 2 >= total_lines:
+        return content, None
+
+    # Merge overlapping ranges and join the segments
+    ranges.sort()
+    merged = [ranges[0]]
+    for low, high in ranges[1:]:
+        if low <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
         else:
-            print(f"Response is not a file content: {content_data}")
-            return None
-    except Exception as e:
-        print(f"Error decoding file content: {str(e)}")
-        return None
+            merged.append((low, high))
 
-def post_review_comment(repo: str, pr_number: str, commit_id: str, file_path: str, 
+    segments = []
+    line_map: List[int] = []
+    for low, high in merged:
+        if line_map:
+            line_map.append(0)  # the '---' separator line
+        segments.append('\n'.join(lines[low:high]))
+        line_map.extend(range(low + 1, high + 1))
+
+    return '\n---\n'.join(segments), line_map
+
+def extract_patch_context(content: str, patch: Optional[str],
+                          context_lines: int = 20) -> str:
+    """
+    Reduce file content to the regions a PR patch touches, plus context.
+
+    Args:
+        content: Full file content at the PR head
+        patch: Unified diff for the file from the PR files listing
+        context_lines: Lines of context to keep around each changed range
+
+    Returns:
+        The reduced content, or the full content when the patch is missing
+        or the changes cover most of the file
+    """
+    return extract_patch_context_with_map(content, patch, context_lines)[0]
+
+def post_review_comment(repo: str, pr_number: str, commit_id: str, file_path: str,
                        position: int, body: str, github_token: str) -> bool:
     """
     Post a review comment on a pull request.
@@ -99,10 +267,7 @@ def post_review_comment(repo: str, pr_number: str, commit_id: str, file_path: st
     Returns:
         True if successful, False otherwise
     """
-    headers = {
-        "Authorization": f"token {github_token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    headers = _get_headers(github_token)
     
     url = f"https://api.github.com/repos/{repo}/pulls/{pr_number}/comments"
     
@@ -113,7 +278,7 @@ def post_review_comment(repo: str, pr_number: str, commit_id: str, file_path: st
         "body": body
     }
     
-    response = requests.post(url, headers=headers, json=data)
+    response = _session.post(url, headers=headers, json=data)
     
     if response.status_code == 201:
         return True
@@ -132,19 +297,16 @@ def get_repository_languages(repo: str, github_token: str) -> Dict[str, int]:
     Returns:
         Dictionary of language name to byte count
     """
-    headers = {
-        "Authorization": f"token {github_token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    headers = _get_headers(github_token)
     
     url = f"https://api.github.com/repos/{repo}/languages"
-    response = requests.get(url, headers=headers)
-    
-    if response.status_code != 200:
-        print(f"Error fetching repository languages: {response.status_code} - {response.text}")
+    status, languages, error = _cached_get(url, headers)
+
+    if status != 200:
+        print(f"Error fetching repository languages: {status} - {error}")
         return {}
-    
-    return response.json()
+
+    return languages
 
 def get_commit_history(repo: str, file_path: str, github_token: str, max_commits: int = 10) -> List[Dict[str, Any]]:
     """
@@ -159,20 +321,15 @@ def get_commit_history(repo: str, file_path: str, github_token: str, max_commits
     Returns:
         List of commit data dictionaries
     """
-    headers = {
-        "Authorization": f"token {github_token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    headers = _get_headers(github_token)
     
     url = f"https://api.github.com/repos/{repo}/commits?path={file_path}&per_page={max_commits}"
-    response = requests.get(url, headers=headers)
-    
-    if response.status_code != 200:
-        print(f"Error fetching commit history: {response.status_code} - {response.text}")
+    status, commits, error = _cached_get(url, headers)
+
+    if status != 200:
+        print(f"Error fetching commit history: {status} - {error}")
         return []
-    
-    commits = response.json()
-    
+
     # Extract relevant information
     commit_history = []
     for commit in commits:
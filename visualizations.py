@@ -1,100 +1,182 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
+from functools import lru_cache
 from typing import Dict, List, Any
+import difflib
+import json
+import os
 import pygments
 from pygments.lexers import get_lexer_by_name, get_lexer_for_filename
 from pygments.formatters import HtmlFormatter
 import re
 
+# Optional: orjson hashes the chart inputs much faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _hash_json(obj: Any) -> bytes:
+    """Serialize chart inputs deterministically for st.cache_data keys."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True).encode('utf-8')
+
+@lru_cache(maxsize=64)
+def _get_lexer(extension: str) -> Any:
+    """
+    Look up the Pygments lexer for a file extension, memoized.
+
+    The lexer lookup walks Pygments' full filename-pattern table, so it is
+    too slow to repeat on every render.
+
+    Args:
+        extension: File extension with leading dot (e.g. '.py')
+
+    Returns:
+        Lexer instance, falling back to plain text when none matches
+    """
+    try:
+        return get_lexer_for_filename(f"file{extension}")
+    except:
+        # Fallback to text if the lexer is not found
+        return get_lexer_by_name('text')
+
+@lru_cache(maxsize=1)
+def _get_formatter() -> HtmlFormatter:
+    """Build the shared HTML formatter once."""
+    return HtmlFormatter(style='monokai')
+
+@lru_cache(maxsize=1)
+def _get_css() -> str:
+    """Build the syntax-highlighting CSS once."""
+    return _get_formatter().get_style_defs('.highlight')
+
+# Severity ranks and the line background color for each rank (0 = no issue)
+_SEV_RANK = {"error": 3, "warning": 2, "info": 1}
+_SEV_BG = (
+    "transparent",
+    "rgba(0, 0, 255, 0.1)",
+    "rgba(255, 165, 0, 0.1)",
+    "rgba(255, 0, 0, 0.1)",
+)
+
+# Matches the opening and closing span tags in Pygments HTML output
+_SPAN_TAG_RE = re.compile(r'<span[^>]*>|</span>')
+
+def _split_highlighted_lines(highlighted_html: str) -> List[str]:
+    """
+    Split Pygments HTML output into per-line fragments.
+
+    Token spans can cross line boundaries (e.g. multi-line strings), so
+    open spans are closed at the end of each line and reopened on the next
+    to keep every fragment well-formed.
+
+    Args:
+        highlighted_html: The inner HTML of a Pygments-highlighted block
+
+    Returns:
+        List of HTML fragments, one per source line
+    """
+    fragments = []
+    open_spans = []
+
+    for line in highlighted_html.split('\n'):
+        prefix = ''.join(open_spans)
+        for match in _SPAN_TAG_RE.finditer(line):
+            if match.group().startswith('</'):
+                if open_spans:
+                    open_spans.pop()
+            else:
+                open_spans.append(match.group())
+        fragments.append(prefix + line + '</span>' * len(open_spans))
+
+    return fragments
+
 def render_annotated_code(code_content: str, issues: List[Dict[str, Any]], file_path: str) -> None:
     """
     Render code with annotations for issues.
-    
+
     Args:
         code_content: The code content as a string
         issues: List of issues found in the code
         file_path: Path to the file
     """
     # Prepare the code for syntax highlighting
-    try:
-        lexer = get_lexer_for_filename(file_path)
-    except:
-        # Fallback to text if the lexer is not found
-        lexer = get_lexer_by_name('text')
-    
-    formatter = HtmlFormatter(style='monokai')
-    css = formatter.get_style_defs('.highlight')
-    
+    lexer = _get_lexer(os.path.splitext(file_path)[1].lower())
+    formatter = _get_formatter()
+
     # Inject the CSS for syntax highlighting
-    st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
-    
-    # Group issues by line number
+    st.markdown(f'<style>{_get_css()}</style>', unsafe_allow_html=True)
+
+    # Group issues by line number, tracking the highest severity rank per
+    # line as we go so the render loop below is a pair of lookups
     issues_by_line = {}
+    max_rank_by_line = {}
     for issue in issues:
         line_num = issue.get("line", 0)
         if line_num not in issues_by_line:
             issues_by_line[line_num] = []
         issues_by_line[line_num].append(issue)
-    
-    # Split the code into lines for display
-    lines = code_content.splitlines()
-    
+
+        # Unrecognized severities render like info, as before
+        rank = _SEV_RANK.get(issue.get("severity", "info"), 1)
+        if rank > max_rank_by_line.get(line_num, 0):
+            max_rank_by_line[line_num] = rank
+
     # Display the code with line numbers and annotations
     st.markdown("### Code with Issues")
-    
-    for i, line in enumerate(lines):
+
+    # Highlight the whole file in one lexer pass and split the result back
+    # into lines: one st.markdown call replaces one call (and one websocket
+    # frame) per line of source
+    highlighted = pygments.highlight(code_content, lexer, formatter)
+    pre_match = re.search(r'<pre>(.*)</pre>', highlighted, re.DOTALL)
+    body = pre_match.group(1) if pre_match else highlighted
+    line_fragments = _split_highlighted_lines(body.rstrip('\n'))
+
+    rows = []
+    for i, fragment in enumerate(line_fragments):
         line_num = i + 1
-        
+
         # Determine the background color based on issues
-        bg_color = "transparent"
-        if line_num in issues_by_line:
-            # Get the highest severity for this line
-            severities = [issue.get("severity", "info") for issue in issues_by_line[line_num]]
-            highest_severity = max(severities, key=lambda s: {"error": 3, "warning": 2, "info": 1}.get(s, 0))
-            
-            if highest_severity == "error":
-                bg_color = "rgba(255, 0, 0, 0.1)"
-            elif highest_severity == "warning":
-                bg_color = "rgba(255, 165, 0, 0.1)"
-            else:
-                bg_color = "rgba(0, 0, 255, 0.1)"
-        
-        # Highlight the line
-        highlighted_line = pygments.highlight(line, lexer, formatter)
-        
-        # Display the line with line number in a flex container
-        st.markdown(
+        bg_color = _SEV_BG[max_rank_by_line.get(line_num, 0)]
+
+        rows.append(
             f'<div style="display: flex; background-color: {bg_color};">'
             f'<div style="width: 50px; text-align: right; padding-right: 10px; color: #888; user-select: none;">{line_num}</div>'
-            f'<div style="flex-grow: 1;">{highlighted_line}</div>'
-            f'</div>',
-            unsafe_allow_html=True
+            f'<div style="flex-grow: 1;" class="highlight"><pre style="margin: 0;">{fragment}</pre></div>'
+            f'</div>'
         )
-        
-        # Display issues for this line
-        if line_num in issues_by_line:
-            with st.expander(f"{len(issues_by_line[line_num])} issue(s) found"):
-                for issue in issues_by_line[line_num]:
-                    severity = issue.get("severity", "info")
-                    severity_color = {"error": "red", "warning": "orange", "info": "blue"}.get(severity, "blue")
-                    
-                    st.markdown(
-                        f'<span style="color: {severity_color}; font-weight: bold;">{severity.upper()}</span>: '
-                        f'{issue.get("message", "No description")}',
-                        unsafe_allow_html=True
-                    )
-                    
-                    # Display suggested fix if available
-                    if "fix" in issue and issue["fix"]:
-                        st.markdown(f"**Suggested fix:** {issue['fix']}")
-                    
-                    # Display source of the issue (static or LLM)
-                    if "type" in issue:
-                        st.markdown(f"**Source:** {issue['type'].upper()}")
-                    
-                    st.markdown("---")
 
+    st.markdown(''.join(rows), unsafe_allow_html=True)
+
+    # Display the issues in a second pass, grouped by line
+    for line_num in sorted(issues_by_line):
+        line_issues = issues_by_line[line_num]
+        with st.expander(f"Line {line_num}: {len(line_issues)} issue(s) found"):
+            for issue in line_issues:
+                severity = issue.get("severity", "info")
+                severity_color = {"error": "red", "warning": "orange", "info": "blue"}.get(severity, "blue")
+
+                st.markdown(
+                    f'<span style="color: {severity_color}; font-weight: bold;">{severity.upper()}</span>: '
+                    f'{issue.get("message", "No description")}',
+                    unsafe_allow_html=True
+                )
+
+                # Display suggested fix if available
+                if "fix" in issue and issue["fix"]:
+                    st.markdown(f"**Suggested fix:** {issue['fix']}")
+
+                # Display source of the issue (static or LLM)
+                if "type" in issue:
+                    st.markdown(f"**Source:** {issue['type'].upper()}")
+
+                st.markdown("---")
+
+@st.cache_data(show_spinner=False, hash_funcs={list: _hash_json, dict: _hash_json})
 def create_tech_debt_chart(tech_debt_scores: Dict[str, Dict[str, Any]]) -> alt.Chart:
     """
     Create a chart to visualize technical debt scores.
@@ -105,21 +187,15 @@ def create_tech_debt_chart(tech_debt_scores: Dict[str, Dict[str, Any]]) -> alt.C
     Returns:
         Altair chart object
     """
-    # Extract the scores for the chart
-    chart_data = []
-    for filename, data in tech_debt_scores.items():
-        # Use just the filename without the full path
-        short_name = filename.split('/')[-1]
-        
-        # Add the overall score
-        chart_data.append({
-            "File": short_name,
-            "Score": data["overall"],
-        })
-    
-    # Create the DataFrame
-    df = pd.DataFrame(chart_data)
-    
+    # Build the DataFrame from the full paths, then strip them to bare
+    # filenames with the vectorized string accessor instead of a Python
+    # split per entry
+    df = pd.DataFrame({
+        "File": pd.Series(list(tech_debt_scores.keys()), dtype=object),
+        "Score": [data["overall"] for data in tech_debt_scores.values()],
+    })
+    df["File"] = df["File"].str.rsplit('/', n=1).str[-1]
+
     # Sort by score in descending order
     df = df.sort_values("Score", ascending=False)
     
@@ -140,6 +216,7 @@ def create_tech_debt_chart(tech_debt_scores: Dict[str, Dict[str, Any]]) -> alt.C
     
     return chart
 
+@st.cache_data(show_spinner=False, hash_funcs={list: _hash_json, dict: _hash_json})
 def create_issue_summary_chart(issues: List[Dict[str, Any]]) -> alt.Chart:
     """
     Create a chart to summarize issues by type and severity.
@@ -150,35 +227,20 @@ def create_issue_summary_chart(issues: List[Dict[str, Any]]) -> alt.Chart:
     Returns:
         Altair chart object
     """
-    # Count issues by type and severity
-    issue_counts = []
-    
-    # Count by type
-    type_counts = {}
-    for issue in issues:
-        issue_type = issue.get("type", "unknown")
-        type_counts[issue_type] = type_counts.get(issue_type, 0) + 1
-    
-    for issue_type, count in type_counts.items():
-        issue_counts.append({
-            "Category": "Type",
-            "Value": issue_type.capitalize(),
-            "Count": count
-        })
-    
-    # Count by severity
-    severity_counts = {}
-    for issue in issues:
-        severity = issue.get("severity", "info")
-        severity_counts[severity] = severity_counts.get(severity, 0) + 1
-    
-    for severity, count in severity_counts.items():
-        issue_counts.append({
-            "Category": "Severity",
-            "Value": severity.capitalize(),
-            "Count": count
-        })
-    
+    # Count issues by type and severity with vectorized value_counts
+    type_counts = pd.Series(
+        [issue.get("type", "unknown") for issue in issues], dtype=object).value_counts()
+    severity_counts = pd.Series(
+        [issue.get("severity", "info") for issue in issues], dtype=object).value_counts()
+
+    issue_counts = [
+        {"Category": "Type", "Value": issue_type.capitalize(), "Count": int(count)}
+        for issue_type, count in type_counts.items()
+    ] + [
+        {"Category": "Severity", "Value": severity.capitalize(), "Count": int(count)}
+        for severity, count in severity_counts.items()
+    ]
+
     # Create the DataFrame
     df = pd.DataFrame(issue_counts)
     
@@ -206,62 +268,81 @@ def render_code_diff(before_content: str, after_content: str, file_path: str) ->
         file_path: Path to the file
     """
     # Prepare the code for syntax highlighting
-    try:
-        lexer = get_lexer_for_filename(file_path)
-    except:
-        # Fallback to text if the lexer is not found
-        lexer = get_lexer_by_name('text')
-    
-    formatter = HtmlFormatter(style='monokai')
-    css = formatter.get_style_defs('.highlight')
-    
+    lexer = _get_lexer(os.path.splitext(file_path)[1].lower())
+    formatter = _get_formatter()
+
     # Inject the CSS for syntax highlighting
-    st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
-    
+    st.markdown(f'<style>{_get_css()}</style>', unsafe_allow_html=True)
+
     # Split the code into lines
     before_lines = before_content.splitlines()
     after_lines = after_content.splitlines()
-    
+
+    # A real diff instead of positional comparison: a single inserted line
+    # no longer marks every following line as changed
+    matcher = difflib.SequenceMatcher(a=before_lines, b=after_lines, autojunk=False)
+
+    before_bg = ["transparent"] * len(before_lines)
+    after_bg = ["transparent"] * len(after_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ("replace", "delete"):
+            for i in range(i1, i2):
+                before_bg[i] = "rgba(255, 0, 0, 0.1)"  # Light red for removed
+        if tag == "replace":
+            for j in range(j1, j2):
+                after_bg[j] = "rgba(0, 255, 0, 0.1)"  # Light green for changes
+        elif tag == "insert":
+            for j in range(j1, j2):
+                after_bg[j] = "rgba(0, 0, 255, 0.1)"  # Light blue for new lines
+
     # Create two columns for side-by-side comparison
     col1, col2 = st.columns(2)
-    
+
     with col1:
         st.markdown("### Before")
-        
-        for i, line in enumerate(before_lines):
-            line_num = i + 1
-            highlighted_line = pygments.highlight(line, lexer, formatter)
-            
-            st.markdown(
-                f'<div style="display: flex;">'
-                f'<div style="width: 30px; text-align: right; padding-right: 10px; color: #888; user-select: none;">{line_num}</div>'
-                f'<div style="flex-grow: 1;">{highlighted_line}</div>'
-                f'</div>',
-                unsafe_allow_html=True
-            )
-    
+        st.markdown(_render_diff_column(before_content, before_bg, lexer, formatter),
+                    unsafe_allow_html=True)
+
     with col2:
         st.markdown("### After")
-        
-        for i, line in enumerate(after_lines):
-            line_num = i + 1
-            highlighted_line = pygments.highlight(line, lexer, formatter)
-            
-            # Highlight changed lines
-            bg_color = "transparent"
-            if i < len(before_lines) and line != before_lines[i]:
-                bg_color = "rgba(0, 255, 0, 0.1)"  # Light green for changes
-            elif i >= len(before_lines):
-                bg_color = "rgba(0, 0, 255, 0.1)"  # Light blue for new lines
-            
-            st.markdown(
-                f'<div style="display: flex; background-color: {bg_color};">'
-                f'<div style="width: 30px; text-align: right; padding-right: 10px; color: #888; user-select: none;">{line_num}</div>'
-                f'<div style="flex-grow: 1;">{highlighted_line}</div>'
-                f'</div>',
-                unsafe_allow_html=True
-            )
+        st.markdown(_render_diff_column(after_content, after_bg, lexer, formatter),
+                    unsafe_allow_html=True)
+
+def _render_diff_column(content: str, bg_colors: List[str], lexer: Any,
+                        formatter: HtmlFormatter) -> str:
+    """
+    Build one diff column as a single HTML blob.
+
+    The whole column is highlighted in one lexer pass and emitted as one
+    string, mirroring the batching in render_annotated_code.
+
+    Args:
+        content: Full code content for the column
+        bg_colors: Background color per line
+        lexer: Pygments lexer for the file
+        formatter: Shared HTML formatter
+
+    Returns:
+        HTML for the column's numbered, highlighted lines
+    """
+    highlighted = pygments.highlight(content, lexer, formatter)
+    pre_match = re.search(r'<pre>(.*)</pre>', highlighted, re.DOTALL)
+    body = pre_match.group(1) if pre_match else highlighted
+    fragments = _split_highlighted_lines(body.rstrip('\n'))
 
+    rows = []
+    for i, fragment in enumerate(fragments):
+        bg_color = bg_colors[i] if i < len(bg_colors) else "transparent"
+        rows.append(
+            f'<div style="display: flex; background-color: {bg_color};">'
+            f'<div style="width: 30px; text-align: right; padding-right: 10px; color: #888; user-select: none;">{i + 1}</div>'
+            f'<div style="flex-grow: 1;" class="highlight"><pre style="margin: 0;">{fragment}</pre></div>'
+            f'</div>'
+        )
+
+    return ''.join(rows)
+
+@st.cache_data(show_spinner=False, hash_funcs={list: _hash_json, dict: _hash_json})
 def create_issue_heatmap(issues: List[Dict[str, Any]], files: List[str]) -> alt.Chart:
     """
     Create a heatmap of issues across files.
@@ -273,37 +354,25 @@ def create_issue_heatmap(issues: List[Dict[str, Any]], files: List[str]) -> alt.
     Returns:
         Altair chart object
     """
-    # Count issues by file and severity
-    heatmap_data = []
-    
-    for file in files:
-        # Use just the filename without the full path
-        short_name = file.split('/')[-1]
-        
-        # Count issues for this file
-        error_count = sum(1 for issue in issues if issue.get("file") == file and issue.get("severity") == "error")
-        warning_count = sum(1 for issue in issues if issue.get("file") == file and issue.get("severity") == "warning")
-        info_count = sum(1 for issue in issues if issue.get("file") == file and issue.get("severity") == "info")
-        
-        # Add to the data
-        heatmap_data.append({
-            "File": short_name,
-            "Severity": "Error",
-            "Count": error_count
-        })
-        heatmap_data.append({
-            "File": short_name,
-            "Severity": "Warning",
-            "Count": warning_count
-        })
-        heatmap_data.append({
-            "File": short_name,
-            "Severity": "Info",
-            "Count": info_count
-        })
-    
-    # Create the DataFrame
-    df = pd.DataFrame(heatmap_data)
+    # Count issues by file and severity in one grouped aggregation instead
+    # of three scans over the issue list per file
+    issue_df = pd.DataFrame({
+        "file": pd.Series([issue.get("file") for issue in issues], dtype=object),
+        "severity": pd.Series([issue.get("severity", "info") for issue in issues], dtype=object),
+    })
+
+    counts = (
+        issue_df.groupby(["file", "severity"]).size()
+        .unstack(fill_value=0)
+        .reindex(index=files, columns=["error", "warning", "info"], fill_value=0)
+    )
+
+    df = counts.stack().reset_index()
+    df.columns = ["File", "Severity", "Count"]
+
+    # Use just the filename without the full path
+    df["File"] = df["File"].str.rsplit('/', n=1).str[-1]
+    df["Severity"] = df["Severity"].str.capitalize()
     
     # Create the heatmap
     chart = alt.Chart(df).mark_rect().encode(